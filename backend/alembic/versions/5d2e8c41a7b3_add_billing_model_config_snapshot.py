@@ -0,0 +1,29 @@
+"""add_billing_model_config_snapshot
+
+Revision ID: 5d2e8c41a7b3
+Revises: 80f41e78541c
+Create Date: 2026-10-17 09:12:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8c41a7b3'
+down_revision: Union[str, None] = '80f41e78541c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows stay NULL and are built on read until the model is next written
+    op.add_column('billingmodel', sa.Column('config_snapshot', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('billingmodel', 'config_snapshot')
@@ -0,0 +1,32 @@
+"""add_agent_id_timestamp_indexes
+
+Revision ID: a91c3f6d2e58
+Revises: 5d2e8c41a7b3
+Create Date: 2026-10-17 10:03:17.542906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c3f6d2e58'
+down_revision: Union[str, None] = '5d2e8c41a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_agentactivity_agent_id_timestamp', 'agentactivity', ['agent_id', 'timestamp'], unique=False)
+    op.create_index('ix_agentcost_agent_id_timestamp', 'agentcost', ['agent_id', 'timestamp'], unique=False)
+    op.create_index('ix_agentoutcome_agent_id_timestamp', 'agentoutcome', ['agent_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_agentoutcome_agent_id_timestamp', table_name='agentoutcome')
+    op.drop_index('ix_agentcost_agent_id_timestamp', table_name='agentcost')
+    op.drop_index('ix_agentactivity_agent_id_timestamp', table_name='agentactivity')
@@ -0,0 +1,55 @@
+"""add_agent_running_totals
+
+Revision ID: d3a8f2b61c47
+Revises: a91c3f6d2e58
+Create Date: 2026-10-17 15:08:12.904716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# The trigger SQL is shared with the models, which create the same triggers on create_all
+from app.models.agent import (
+    RUNNING_TOTALS,
+    drop_running_total_postgresql_sql,
+    running_total_postgresql_sql,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f2b61c47'
+down_revision: Union[str, None] = 'a91c3f6d2e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('agent', sa.Column('activity_count', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('agent', sa.Column('total_cost', sa.Numeric(), server_default='0', nullable=False))
+    op.add_column('agent', sa.Column('total_outcomes_value', sa.Numeric(), server_default='0', nullable=False))
+
+    # Backfill from existing rows
+    op.execute("""
+        UPDATE agent SET
+            activity_count = (SELECT COUNT(*) FROM agentactivity WHERE agentactivity.agent_id = agent.id),
+            total_cost = COALESCE((SELECT SUM(CAST(amount AS NUMERIC)) FROM agentcost WHERE agentcost.agent_id = agent.id), 0),
+            total_outcomes_value = COALESCE((SELECT SUM(CAST(value AS NUMERIC)) FROM agentoutcome WHERE agentoutcome.agent_id = agent.id), 0)
+    """)
+
+    for table_name in RUNNING_TOTALS:
+        for statement in running_total_postgresql_sql(table_name):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in RUNNING_TOTALS:
+        for statement in drop_running_total_postgresql_sql(table_name):
+            op.execute(statement)
+
+    op.drop_column('agent', 'total_outcomes_value')
+    op.drop_column('agent', 'total_cost')
+    op.drop_column('agent', 'activity_count')
@@ -0,0 +1,42 @@
+"""add_covering_columns_to_agent_indexes
+
+Revision ID: e5c1a7d94b08
+Revises: d3a8f2b61c47
+Create Date: 2026-10-17 16:41:27.115062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1a7d94b08'
+down_revision: Union[str, None] = 'd3a8f2b61c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Carry the summed columns in the (agent_id, timestamp) indexes so per-agent
+    # sums over a period can be answered with index-only scans
+    op.drop_index('ix_agentcost_agent_id_timestamp', table_name='agentcost')
+    op.create_index(
+        'ix_agentcost_agent_id_timestamp', 'agentcost', ['agent_id', 'timestamp'],
+        unique=False, postgresql_include=['amount', 'cost_type'],
+    )
+    op.drop_index('ix_agentoutcome_agent_id_timestamp', table_name='agentoutcome')
+    op.create_index(
+        'ix_agentoutcome_agent_id_timestamp', 'agentoutcome', ['agent_id', 'timestamp'],
+        unique=False, postgresql_include=['value'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_agentoutcome_agent_id_timestamp', table_name='agentoutcome')
+    op.create_index('ix_agentoutcome_agent_id_timestamp', 'agentoutcome', ['agent_id', 'timestamp'], unique=False)
+    op.drop_index('ix_agentcost_agent_id_timestamp', table_name='agentcost')
+    op.create_index('ix_agentcost_agent_id_timestamp', 'agentcost', ['agent_id', 'timestamp'], unique=False)
@@ -0,0 +1,42 @@
+"""store_api_key_hash_as_bytes
+
+Revision ID: f2b9c6e8a413
+Revises: e5c1a7d94b08
+Create Date: 2026-10-17 19:12:48.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9c6e8a413'
+down_revision: Union[str, None] = 'e5c1a7d94b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same SHA-256 digest, stored as its 32 raw bytes instead of 64 hex chars;
+    # existing keys convert in place and keep authenticating
+    op.alter_column(
+        'apikey', 'key_hash',
+        existing_type=sa.String(length=255),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=False,
+        postgresql_using="decode(key_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'apikey', 'key_hash',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+        postgresql_using="encode(key_hash, 'hex')",
+    )
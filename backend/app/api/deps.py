@@ -4,7 +4,6 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from jwt.exceptions import InvalidTokenError
-from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app import schemas
@@ -47,8 +46,8 @@ def get_current_user(
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+        token_data = schemas.TokenPayload.from_claims(payload)
+    except (InvalidTokenError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -122,11 +121,11 @@ def get_current_user_flexible(
             payload = jwt.decode(
                 jwt_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
-            token_data = schemas.TokenPayload(**payload)
+            token_data = schemas.TokenPayload.from_claims(payload)
             user = db.query(User).filter(User.id == token_data.sub).first()
             if user and getattr(user, 'is_active', False):
                 return user
-        except (InvalidTokenError, ValidationError):
+        except (InvalidTokenError, ValueError):
             pass  # Fall through to API key authentication
     
     # Try API key authentication
@@ -1,6 +1,6 @@
-from typing import Any, List, Optional
+from typing import Annotated, Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app import schemas
@@ -9,6 +9,9 @@ from app.services import agent_service, organization_service
 
 router = APIRouter()
 
+# Largest batch accepted by record_activities_batch; it is written in one transaction
+MAX_ACTIVITY_BATCH_SIZE = 1000
+
 
 @router.get("", response_model=List[schemas.Agent])
 def read_agents(
@@ -166,7 +169,7 @@ def update_agent(
     
     # Update agent
     try:
-        updated_agent = agent_service.update_agent(db, agent_id=agent_id, agent_in=agent_in)
+        updated_agent = agent_service.update_agent(db, agent_id=agent_id, agent_in=agent_in, agent=agent)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -204,7 +207,7 @@ def delete_agent(
         )
     
     # Delete agent
-    agent = agent_service.delete_agent(db, agent_id=agent_id)
+    agent = agent_service.delete_agent(db, agent_id=agent_id, agent=agent)
     return agent
 
 
@@ -255,6 +258,53 @@ def record_activity(
     return activity
 
 
+@router.post("/{agent_id}/activities/batch", response_model=List[schemas.AgentActivity])
+def record_activities_batch(
+    *,
+    db: Session = Depends(deps.get_db),
+    agent_id: int,
+    activities_in: Annotated[List[schemas.AgentActivityCreate], Body(max_length=MAX_ACTIVITY_BATCH_SIZE)],
+    current_user: schemas.User = Depends(deps.get_current_user_flexible),
+) -> Any:
+    """
+    Record a batch of activities for an agent in a single transaction.
+    
+    Users can only record activities for agents in their own organization unless they are superusers.
+    """
+    # Ensure agent_id in path matches every activity in the request body
+    if any(activity_in.agent_id != agent_id for activity_in in activities_in):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Agent ID in path must match the one in every activity",
+        )
+    
+    # Get agent to check permissions
+    agent = agent_service.get_agent(db, agent_id=agent_id)
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found",
+        )
+    
+    # Check permissions
+    if not current_user.is_superuser and (not current_user.organization_id or current_user.organization_id != agent.organization_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to record activities for this agent",
+        )
+    
+    # Record activities
+    try:
+        activities = agent_service.record_agent_activities(db, agent_id=agent_id, activities_in=activities_in)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    return activities
+
+
 @router.post("/{agent_id}/costs", response_model=schemas.AgentCost)
 def record_cost(
     *,
@@ -435,6 +485,7 @@ def get_agent_billing_summary(
     agent_id: int,
     start_date: Optional[str] = Query(None, description="Start date filter (ISO format)"),
     end_date: Optional[str] = Query(None, description="End date filter (ISO format)"),
+    include_breakdown: bool = Query(True, description="Include every cost row in cost_breakdown"),
     db: Session = Depends(deps.get_db),
     current_user: schemas.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -484,7 +535,8 @@ def get_agent_billing_summary(
     # Get agent billing summary
     try:
         summary = agent_service.get_agent_billing_summary(
-            db, agent_id=agent_id, start_date=parsed_start_date, end_date=parsed_end_date
+            db, agent_id=agent_id, start_date=parsed_start_date, end_date=parsed_end_date,
+            include_breakdown=include_breakdown
         )
         return summary
     except ValueError as e:
@@ -7,7 +7,7 @@ from pydantic import ValidationError
 from app import schemas
 from app.api import deps
 from app.services import billing_model_service, organization_service
-from app.services.billing_model.calculation import calculate_cost
+from app.services.billing_model.calculation import get_cost_fn
 
 router = APIRouter()
 
@@ -236,7 +236,7 @@ def calculate_billing_cost(
     
     # Calculate cost
     try:
-        cost = calculate_cost(billing_model, usage_data)
+        cost = get_cost_fn(billing_model)(usage_data)
         return {
             "cost": cost,
             "currency": "USD",  # Default currency
@@ -32,7 +32,8 @@ def _create_extraction_event(
 ):
     """Background task to create an extraction event for billing tracking"""
     try:
-        event_data = integration_schemas.EventCreate(
+        # All values are server-generated, so skip re-validating them
+        event_data = integration_schemas.EventCreate.model_construct(
             source_type="connector",
             source_id=connector_id,
             event_type="data_extraction",
@@ -104,6 +105,26 @@ def _get_live_connector_data(connector_id: str) -> Dict[str, Any]:
         }
     }
 
+def _connector_to_dict(db_connector) -> Dict[str, Any]:
+    """Convert a connector row to a response dict merged with live manager data"""
+    connector_dict = {
+        "id": str(db_connector.id),
+        "connector_id": str(db_connector.connector_id),
+        "organization_id": db_connector.organization_id,
+        "name": str(db_connector.name),
+        "connector_type": str(db_connector.connector_type),
+        "config": db_connector.config or {},
+        "description": db_connector.description,
+        "status": str(db_connector.status),
+        "health_status": db_connector.health_status,
+        "last_health_check": db_connector.last_health_check,
+        "metrics": db_connector.metrics or {},
+        "created_at": db_connector.created_at,
+        "updated_at": db_connector.updated_at
+    }
+    connector_dict.update(_get_live_connector_data(str(db_connector.connector_id)))
+    return connector_dict
+
 # ===== CONNECTOR ENDPOINTS =====
 
 @router.post("/connectors", response_model=integration_schemas.ConnectorResponse)
@@ -137,7 +158,7 @@ async def create_connector(
             config=config_dict
         )
         # Update database with initial status
-        update_data = integration_schemas.ConnectorUpdate(
+        update_data = integration_schemas.ConnectorUpdate.model_construct(
             name=connector_in.name,
             description=connector_in.description,
             status=ConnectorStatusEnum.ACTIVE
@@ -189,26 +210,7 @@ async def list_connectors(
     # Enhance with live data from connector manager
     detailed_connectors = []
     for db_connector in db_connectors:
-        # Convert to dict, handling SQLAlchemy model attributes
-        connector_dict = {
-            "id": str(db_connector.id),
-            "connector_id": str(db_connector.connector_id),
-            "organization_id": db_connector.organization_id,
-            "name": str(db_connector.name),
-            "connector_type": str(db_connector.connector_type),
-            "config": db_connector.config or {},
-            "description": db_connector.description,
-            "status": str(db_connector.status),
-            "health_status": db_connector.health_status,
-            "last_health_check": db_connector.last_health_check,
-            "metrics": db_connector.metrics or {},
-            "created_at": db_connector.created_at,
-            "updated_at": db_connector.updated_at
-        }
-        
-        # Add live health and metrics if available
-        live_data = _get_live_connector_data(str(db_connector.connector_id))
-        connector_dict.update(live_data)
+        connector_dict = _connector_to_dict(db_connector)
         
         # Sync to manager if not present
         connector_id_str = str(db_connector.connector_id)
@@ -224,8 +226,9 @@ async def list_connectors(
             except Exception as e:
                 logger.warning(f"Failed to sync connector {connector_id_str}: {e}")
         
-        detailed_connectors.append(integration_schemas.ConnectorDetailResponse(**connector_dict))
+        detailed_connectors.append(connector_dict)
     
+    # Plain dicts: FastAPI validates them once against the response_model
     return detailed_connectors
 
 @router.get("/connectors/{connector_id}", response_model=integration_schemas.ConnectorDetailResponse)
@@ -245,26 +248,7 @@ async def get_connector(
             detail="Connector not found"
         )
     
-    # Convert to dict, handling SQLAlchemy model attributes
-    connector_dict = {
-        "id": str(db_connector.id),
-        "connector_id": str(db_connector.connector_id),
-        "organization_id": db_connector.organization_id,
-        "name": str(db_connector.name),
-        "connector_type": str(db_connector.connector_type),
-        "config": db_connector.config or {},
-        "description": db_connector.description,
-        "status": str(db_connector.status),
-        "health_status": db_connector.health_status,
-        "last_health_check": db_connector.last_health_check,
-        "metrics": db_connector.metrics or {},
-        "created_at": db_connector.created_at,
-        "updated_at": db_connector.updated_at
-    }
-    
-    # Get live data from connector manager
-    live_data = _get_live_connector_data(connector_id)
-    connector_dict.update(live_data)
+    connector_dict = _connector_to_dict(db_connector)
     
     # Sync to manager if not present
     if connector_id not in connector_manager.connectors:
@@ -279,7 +263,7 @@ async def get_connector(
         except Exception as e:
             logger.warning(f"Failed to sync connector {connector_id}: {e}")
     
-    return integration_schemas.ConnectorDetailResponse(**connector_dict)
+    return connector_dict
 
 @router.put("/connectors/{connector_id}", response_model=integration_schemas.ConnectorResponse)
 async def update_connector(
@@ -362,7 +346,7 @@ async def bulk_connector_operations(
                 
             elif bulk_request.operation == "start":
                 # Activate connector
-                update_data = integration_schemas.ConnectorUpdate(
+                update_data = integration_schemas.ConnectorUpdate.model_construct(
                     name = str(db_connector.name),
                     description= str(db_connector.description),
                     status= ConnectorStatusEnum.ACTIVE,
@@ -377,7 +361,7 @@ async def bulk_connector_operations(
                 
             elif bulk_request.operation == "stop":
                 # Deactivate connector
-                update_data = integration_schemas.ConnectorUpdate(
+                update_data = integration_schemas.ConnectorUpdate.model_construct(
                     name=str(db_connector.name),
                     description=str(db_connector.description),
                     status= ConnectorStatusEnum.INACTIVE,
@@ -409,7 +393,7 @@ async def bulk_connector_operations(
             })
             failed_count += 1
     
-    return integration_schemas.BulkOperationResponse(
+    return integration_schemas.BulkOperationResponse.model_construct(
         operation=bulk_request.operation,
         total_count=len(bulk_request.connector_ids),
         successful_count=successful_count,
@@ -588,7 +572,7 @@ async def test_connector(
         
         # Update database with health status
         status_str = ConnectorStatusEnum.ACTIVE if health.is_healthy else ConnectorStatusEnum.ERROR
-        update_data = integration_schemas.ConnectorUpdate(
+        update_data = integration_schemas.ConnectorUpdate.model_construct(
             name=str(db_connector.name),
             description=str(db_connector.description),
             status=status_str,
@@ -596,7 +580,7 @@ async def test_connector(
         )
         integration_service.update_connector(db, connector_id, organization_id, update_data)
         
-        return integration_schemas.HealthStatusSchema(
+        return integration_schemas.HealthStatusSchema.model_construct(
             is_healthy=health.is_healthy,
             last_check=health.last_check,
             response_time=health.response_time,
@@ -683,7 +667,7 @@ async def extract_data(
             "last_records_extracted": len(data)
         })
         
-        update_data = integration_schemas.ConnectorUpdate(
+        update_data = integration_schemas.ConnectorUpdate.model_construct(
             name=str(db_connector.name),
             description=str(db_connector.description),
             metrics=current_metrics
@@ -692,7 +676,7 @@ async def extract_data(
         
         logger.info(f"Extracted {len(data)} records from connector {connector_id}")
         
-        return integration_schemas.ExtractionResponse(
+        return integration_schemas.ExtractionResponse.model_construct(
             connector_id=connector_id,
             records_extracted=len(data),
             data=data,
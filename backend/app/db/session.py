@@ -3,6 +3,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
 from contextlib import contextmanager
+import json
 import time
 import logging
 
@@ -16,6 +17,10 @@ logger = logging.getLogger(__name__)
 if not settings.SQLALCHEMY_DATABASE_URI:
     raise ValueError("SQLALCHEMY_DATABASE_URI is not configured")
 
+# Shared compact encoder for JSON columns (details, metadata, config payloads);
+# reusing one instance avoids building an encoder per json.dumps call
+_json_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
 logger.info(f"Creating database engine for: {settings.POSTGRES_SERVER}")
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
@@ -24,6 +29,7 @@ engine = create_engine(
     max_overflow=20,     # Max number of connections above pool_size
     pool_timeout=30,     # Seconds to wait before timing out on getting a connection
     pool_recycle=1800,   # Recycle connections after 30 minutes to avoid stale connections
+    json_serializer=_json_encoder.encode,
     echo=True if logger.level == logging.DEBUG else False  # Log SQL queries in debug mode
     # Local PostgreSQL doesn't require SSL
 )
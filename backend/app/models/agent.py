@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean, JSON, DateTime, Float
+from typing import List
+
+from sqlalchemy import Column, String, Text, Integer, BigInteger, ForeignKey, Boolean, JSON, DateTime, Float, Numeric, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime, UTC
 
@@ -26,6 +28,13 @@ class Agent(BaseModel):
     type = Column(String(100), nullable=True)
     capabilities = Column(JSON, nullable=False, default=[])
     
+    # Running totals maintained by database triggers on the activity, cost and
+    # outcome tables (see RUNNING_TOTALS below); never written by the ORM. The
+    # sums are NUMERIC so adding and later subtracting a row is exact.
+    activity_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    total_cost = Column(Numeric(asdecimal=False), nullable=False, default=0.0, server_default="0")
+    total_outcomes_value = Column(Numeric(asdecimal=False), nullable=False, default=0.0, server_default="0")
+    
     # Relationships
     organization = relationship("Organization", back_populates="agents")
     billing_model = relationship("BillingModel", back_populates="agents")
@@ -49,6 +58,8 @@ class AgentActivity(BaseModel):
     timestamp = Column(DateTime, default=lambda: datetime.now(UTC))
     activity_metadata = Column(JSON, nullable=True)  # Additional information about the activity
     
+    __table_args__ = (Index("ix_agentactivity_agent_id_timestamp", "agent_id", "timestamp"),)
+    
     # Relationships
     agent = relationship("Agent", back_populates="activities")
     
@@ -67,6 +78,13 @@ class AgentCost(BaseModel):
     timestamp = Column(DateTime, default=lambda: datetime.now(UTC))
     details = Column(JSON, nullable=True)
     
+    __table_args__ = (
+        Index(
+            "ix_agentcost_agent_id_timestamp", "agent_id", "timestamp",
+            postgresql_include=["amount", "cost_type"],
+        ),
+    )
+    
     # Relationships
     agent = relationship("Agent", back_populates="costs")
     
@@ -86,8 +104,110 @@ class AgentOutcome(BaseModel):
     details = Column(JSON, nullable=True)
     verified = Column(Boolean, default=False)  # Whether the outcome has been verified
     
+    __table_args__ = (
+        Index(
+            "ix_agentoutcome_agent_id_timestamp", "agent_id", "timestamp",
+            postgresql_include=["value"],
+        ),
+    )
+    
     # Relationships
     agent = relationship("Agent", back_populates="outcomes")
     
     def __str__(self) -> str:
-        return f"AgentOutcome(agent_id={self.agent_id}, type={self.outcome_type}, value={self.value})"
\ No newline at end of file
+        return f"AgentOutcome(agent_id={self.agent_id}, type={self.outcome_type}, value={self.value})"
+
+
+# Agent column kept in sync by triggers on each child table, the amount a row
+# contributes to it, and the columns whose updates matter
+RUNNING_TOTALS = {
+    AgentActivity.__table__.name: ("activity_count", "1", "agent_id"),
+    AgentCost.__table__.name: ("total_cost", "CAST({row}amount AS NUMERIC)", "agent_id, amount"),
+    AgentOutcome.__table__.name: ("total_outcomes_value", "CAST({row}value AS NUMERIC)", "agent_id, value"),
+}
+
+
+def running_total_postgresql_sql(table_name: str) -> List[str]:
+    """
+    PostgreSQL statements creating the triggers that keep an agent running total in sync
+
+    The triggers fire once per statement and read the changed rows from
+    transition tables, so a multi-row write issues one grouped UPDATE of the
+    agents it touched rather than one per row.
+    """
+    column, delta, _ = RUNNING_TOTALS[table_name]
+    added = f"SELECT agent_id, {delta.format(row='')} AS delta FROM new_rows"
+    removed = f"SELECT agent_id, -{delta.format(row='')} AS delta FROM old_rows"
+
+    def apply(changed: str) -> str:
+        # Updates that leave every total unchanged don't touch the agent rows
+        return (
+            f"UPDATE agent SET {column} = agent.{column} + changes.delta FROM ("
+            f"SELECT agent_id, SUM(delta) AS delta FROM ({changed}) AS changed "
+            f"GROUP BY agent_id HAVING SUM(delta) <> 0"
+            f") AS changes WHERE agent.id = changes.agent_id;"
+        )
+
+    trigger = f"{table_name}_running_total"
+    statements = [
+        f"CREATE FUNCTION {trigger}() RETURNS trigger AS $$ BEGIN "
+        f"IF TG_OP = 'INSERT' THEN {apply(added)} "
+        f"ELSIF TG_OP = 'DELETE' THEN {apply(removed)} "
+        f"ELSE {apply(f'{added} UNION ALL {removed}')} END IF; "
+        f"RETURN NULL; END $$ LANGUAGE plpgsql"
+    ]
+    # A trigger with transition tables can only fire on one event and can't
+    # list columns, so updates of unrelated columns are filtered by the HAVING
+    for event_name, transition_tables in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ):
+        statements.append(
+            f"CREATE TRIGGER {trigger}_{event_name.lower()} AFTER {event_name} ON {table_name} "
+            f"REFERENCING {transition_tables} FOR EACH STATEMENT EXECUTE FUNCTION {trigger}()"
+        )
+    return statements
+
+
+def drop_running_total_postgresql_sql(table_name: str) -> List[str]:
+    """
+    PostgreSQL statements dropping the running total triggers of a child table
+    """
+    trigger = f"{table_name}_running_total"
+    return [
+        *(f"DROP TRIGGER {trigger}_{event_name} ON {table_name}" for event_name in ("insert", "delete", "update")),
+        f"DROP FUNCTION {trigger}()",
+    ]
+
+
+def _running_total_sqlite_ddl(table_name: str) -> List[DDL]:
+    """
+    SQLite trigger DDL keeping an agent running total in sync, one row at a time
+    """
+    column, delta, watched = RUNNING_TOTALS[table_name]
+
+    def apply(row: str, sign: str) -> str:
+        return (
+            f"UPDATE agent SET {column} = {column} {sign} {delta.format(row=f'{row}.')} "
+            f"WHERE id = {row}.agent_id;"
+        )
+
+    return [
+        DDL(
+            f"CREATE TRIGGER {table_name}_running_total_{event_name} AFTER {event_sql} ON {table_name} "
+            f"BEGIN {body} END;"
+        ).execute_if(dialect="sqlite")
+        for event_name, event_sql, body in (
+            ("insert", "INSERT", apply("NEW", "+")),
+            ("delete", "DELETE", apply("OLD", "-")),
+            ("update", f"UPDATE OF {watched}", apply("OLD", "-") + " " + apply("NEW", "+")),
+        )
+    ]
+
+
+for _table in (AgentActivity.__table__, AgentCost.__table__, AgentOutcome.__table__):
+    for _sql in running_total_postgresql_sql(_table.name):
+        event.listen(_table, "after_create", DDL(_sql).execute_if(dialect="postgresql"))
+    for _ddl in _running_total_sqlite_ddl(_table.name):
+        event.listen(_table, "after_create", _ddl)
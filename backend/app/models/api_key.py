@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Text, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,7 +13,7 @@ class ApiKey(BaseModel):
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)  # Owner of the API key
     organization_id = Column(Integer, ForeignKey("organization.id"), nullable=False)  # Organization the key belongs to
     name = Column(String(100), nullable=False)
-    key_hash = Column(String(255), nullable=False, unique=True)  # Hashed version of the key
+    key_hash = Column(LargeBinary(32), nullable=False, unique=True)  # SHA-256 digest of the key
     key_prefix = Column(String(20), nullable=False)  # First few chars for display
     is_active = Column(Boolean, default=True)
     last_used = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Boolean, DateTime, JSON, event
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -17,6 +17,9 @@ class BillingModel(BaseModel):
     # Whether this billing model is active
     is_active = Column(Boolean, default=True)
     
+    # Denormalized effective config, rebuilt whenever the model or its configs are written
+    config_snapshot = Column(JSON, nullable=True)
+    
     # Relationships
     organization = relationship("Organization", back_populates="billing_models")
     agents = relationship("Agent", back_populates="billing_model")
@@ -60,9 +63,48 @@ class BillingModel(BaseModel):
         passive_deletes=True
     )
     
+    def _config_index(self, relationship_name: str, type_attr: str) -> dict:
+        """Config collection keyed by type, built once per loaded collection"""
+        indexes = self.__dict__.setdefault("_config_indexes", {})
+        index = indexes.get(relationship_name)
+        if index is None:
+            # Types are not unique; the first config of a type wins, as in a linear scan
+            index = indexes[relationship_name] = {}
+            for cfg in getattr(self, relationship_name):
+                index.setdefault(getattr(cfg, type_attr), cfg)
+        return index
+
+    @property
+    def activity_config_by_type(self) -> dict:
+        """Activity configs keyed by activity_type"""
+        return self._config_index("activity_config", "activity_type")
+
+    @property
+    def outcome_config_by_type(self) -> dict:
+        """Outcome configs keyed by outcome_type"""
+        return self._config_index("outcome_config", "outcome_type")
+
+    @property
+    def workflow_types_by_type(self) -> dict:
+        """Workflow type configs keyed by workflow_type"""
+        return self._config_index("workflow_types", "workflow_type")
+
     def __str__(self) -> str:
         return f"BillingModel(name={self.name}, type={self.model_type})"
 
+
+def _drop_config_indexes(target, *args) -> None:
+    """Forget the by-type indexes when the config collections may have changed"""
+    target.__dict__.pop("_config_indexes", None)
+
+
+event.listen(BillingModel, "expire", _drop_config_indexes)
+event.listen(BillingModel, "refresh", _drop_config_indexes)
+for _collection in (BillingModel.activity_config, BillingModel.outcome_config, BillingModel.workflow_types):
+    for _event_name in ("append", "remove", "bulk_replace"):
+        event.listen(_collection, _event_name, _drop_config_indexes)
+
+
 class AgentBasedConfig(BaseModel):
     """
     Configuration for agent-based billing
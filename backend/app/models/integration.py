@@ -4,7 +4,7 @@ These models provide persistence for the integration layer with proper multi-ten
 """
 import uuid
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime, UTC
 
 from app.models.base import BaseModel
@@ -106,9 +106,9 @@ class IntegrationEvent(BaseModel):
     # Event timing
     timestamp = Column(DateTime, nullable=False, default=lambda: datetime.now(UTC))
     
-    # Event data
-    raw_data = Column(JSON, nullable=False)
-    processed_data = Column(JSON, nullable=True)
+    # Event data - large payloads are only loaded when accessed
+    raw_data = deferred(Column(JSON, nullable=False), group="payload")
+    processed_data = deferred(Column(JSON, nullable=True), group="payload")
     
     # Processing status
     processing_status = Column(String(50), default='pending')  # 'pending', 'processed', 'failed', 'skipped'
@@ -15,4 +15,20 @@ from .agent import (
 from .invoice import (
     Invoice, InvoiceCreate, InvoiceUpdate, InvoiceWithItems,
     InvoiceLineItem, InvoiceLineItemCreate
-)
\ No newline at end of file
+)
+from .integration import ConnectorResponse, ConnectorDetailResponse, EventResponse, WebhookResponse, StreamResponse
+
+# Read schemas defer building their validators; build them once at startup
+# so the first request served by a worker doesn't pay for it.
+_RESPONSE_SCHEMAS = (
+    User, ApiKey, ApiKeyWithUser, Organization, BillingModel,
+    Agent, AgentActivity, AgentCost, AgentOutcome,
+    Invoice, InvoiceWithItems, InvoiceLineItem,
+    ConnectorResponse, ConnectorDetailResponse, EventResponse, WebhookResponse, StreamResponse,
+)
+
+
+def warm_up_schemas() -> None:
+    """Build the validators of all deferred response schemas"""
+    for schema in _RESPONSE_SCHEMAS:
+        schema.model_rebuild()
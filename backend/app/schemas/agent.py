@@ -1,19 +1,21 @@
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from typing import Optional, List
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas.common import JSONObject
+
 
 class AgentBase(BaseModel):
     """Base agent schema"""
     name: str
     description: Optional[str] = None
-    config: Optional[Dict[str, Any]] = None
+    config: Optional[JSONObject] = None
     is_active: bool = True
     external_id: Optional[str] = None
     # New fields from revised schema
     status: str = 'active'
     type: Optional[str] = None
-    capabilities: List = []
+    capabilities: List = Field(default_factory=list)
 
 
 class AgentCreate(AgentBase):
@@ -26,7 +28,7 @@ class AgentUpdate(BaseModel):
     """Schema for updating agents"""
     name: Optional[str] = None
     description: Optional[str] = None
-    config: Optional[Dict[str, Any]] = None
+    config: Optional[JSONObject] = None
     is_active: Optional[bool] = None
     billing_model_id: Optional[int] = None
     status: Optional[str] = None
@@ -45,6 +47,7 @@ class AgentInDBBase(AgentBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
 class Agent(AgentInDBBase):
@@ -63,7 +66,7 @@ class AgentWithStats(Agent):
 class AgentActivityBase(BaseModel):
     """Base agent activity schema"""
     activity_type: str
-    activity_metadata: Optional[Dict[str, Any]] = None
+    activity_metadata: Optional[JSONObject] = None
 
 
 class AgentActivityCreate(AgentActivityBase):
@@ -79,6 +82,7 @@ class AgentActivityInDB(AgentActivityBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
 class AgentActivity(AgentActivityInDB):
@@ -91,7 +95,7 @@ class AgentCostBase(BaseModel):
     cost_type: str
     amount: float
     currency: str = "USD"
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[JSONObject] = None
 
 
 class AgentCostCreate(AgentCostBase):
@@ -107,6 +111,7 @@ class AgentCostInDB(AgentCostBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
 class AgentCost(AgentCostInDB):
@@ -119,7 +124,7 @@ class AgentOutcomeBase(BaseModel):
     outcome_type: str
     value: float
     currency: str = "USD"
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[JSONObject] = None
     verified: bool = False
 
 
@@ -136,6 +141,7 @@ class AgentOutcomeInDB(AgentOutcomeBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
 class AgentOutcome(AgentOutcomeInDB):
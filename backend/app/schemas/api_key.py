@@ -35,6 +35,7 @@ class ApiKeyInDB(ApiKeyBase):
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 class ApiKey(ApiKeyInDB):
@@ -1,98 +1,198 @@
-from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 
-class BillingModelBase(BaseModel):
-    """Base billing model schema"""
-    name: str
+# Specific configuration schemas for different billing types
+class AgentBasedConfigSchema(BaseModel):
+    """Configuration schema for agent-based billing"""
+    base_agent_fee: float
+    billing_frequency: str = "monthly"  # monthly, yearly
+    setup_fee: float = 0.0
+    volume_discount_enabled: bool = False
+    volume_discount_threshold: Optional[int] = None
+    volume_discount_percentage: Optional[float] = None
+    agent_tier: str = "professional"  # starter, professional, enterprise
+    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per agent
+    
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
+
+class ActivityBasedConfigSchema(BaseModel):
+    """Configuration schema for enhanced activity-based billing"""
+    price_per_unit: float
+    activity_type: str  # api_call, query, completion, tokens, etc.
+    unit_type: str = "action"  # action, token, minute, request, etc.
+    base_agent_fee: float = 0.0  # Optional base fee per agent
+    volume_pricing_enabled: bool = False
+    volume_tier_1_threshold: Optional[int] = None
+    volume_tier_1_price: Optional[float] = None
+    volume_tier_2_threshold: Optional[int] = None
+    volume_tier_2_price: Optional[float] = None
+    volume_tier_3_threshold: Optional[int] = None
+    volume_tier_3_price: Optional[float] = None
+    minimum_charge: float = 0.0
+    billing_frequency: str = "monthly"  # monthly, daily, per_use
+    is_active: bool = True
+    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per unit
+    
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
+
+
+class OutcomeBasedConfigSchema(BaseModel):
+    """Configuration schema for sophisticated outcome-based billing"""
+    # Outcome identification
+    outcome_name: str  # e.g., "Revenue Uplift", "Cost Savings"
+    outcome_type: str  # revenue_uplift, cost_savings, lead_generation, etc.
     description: Optional[str] = None
-    model_type: str = Field(..., description="One of: 'agent', 'activity', 'outcome', 'workflow'")
+    
+    # Base platform fee (covers operational costs even if no success)
+    base_platform_fee: float = 0.0
+    platform_fee_frequency: str = "monthly"  # monthly, yearly
+    
+    # Primary outcome pricing
+    percentage: Optional[float] = None  # e.g., 5% of revenue uplift
+    fixed_charge_per_outcome: Optional[float] = None  # e.g., $10 per lead
+    
+    # Success attribution settings
+    attribution_window_days: int = 30  # How long to attribute outcomes
+    minimum_attribution_value: Optional[float] = None  # Minimum value to qualify for billing
+    requires_verification: bool = True  # Whether outcomes need verification
+    
+    # Risk adjustment and caps
+    success_rate_assumption: Optional[float] = None  # Expected success rate (e.g., 0.70 = 70%)
+    risk_premium_percentage: float = 40.0  # Risk premium (30-50%)
+    
+    # Performance caps and guarantees
+    monthly_cap_amount: Optional[float] = None  # Maximum billing per month
+    success_bonus_threshold: Optional[float] = None  # Value threshold for bonus
+    success_bonus_percentage: Optional[float] = None  # Additional percentage for exceeding threshold
+    
+    # Multi-tier outcome pricing
+    tier_1_threshold: Optional[float] = None  # First tier threshold
+    tier_1_percentage: Optional[float] = None  # Percentage for tier 1
+    tier_2_threshold: Optional[float] = None  # Second tier threshold
+    tier_2_percentage: Optional[float] = None  # Percentage for tier 2
+    tier_3_threshold: Optional[float] = None  # Third tier threshold
+    tier_3_percentage: Optional[float] = None  # Percentage for tier 3
+    
+    # Billing configuration
+    billing_frequency: str = "monthly"  # monthly, quarterly
+    currency: str = "USD"
+    
+    # Status and settings
     is_active: bool = True
+    auto_bill_verified_outcomes: bool = False  # Auto-bill verified outcomes
+    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per outcome
+    
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
 
 
-class BillingModelCreate(BillingModelBase):
-    """Schema for creating billing models"""
-    organization_id: int
+class WorkflowBasedConfigSchema(BaseModel):
+    """Configuration schema for workflow-based billing"""
+    base_platform_fee: float = 0.0
+    platform_fee_frequency: str = "monthly"  # monthly, yearly
+    default_billing_frequency: str = "monthly"
+    volume_discount_enabled: bool = False
+    volume_discount_threshold: Optional[int] = None
+    volume_discount_percentage: Optional[float] = None
+    overage_multiplier: float = 1.0
+    currency: str = "USD"
+    is_active: bool = True
+    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent for platform
     
-    # Agent-based config fields
-    agent_base_agent_fee: Optional[float] = None
-    agent_billing_frequency: Optional[str] = "monthly"
-    agent_setup_fee: Optional[float] = 0.0
-    agent_volume_discount_enabled: Optional[bool] = False
-    agent_volume_discount_threshold: Optional[int] = None
-    agent_volume_discount_percentage: Optional[float] = None
-    agent_tier: Optional[str] = "professional"
-    agent_human_equivalent_value: Optional[float] = None
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
+
+
+class WorkflowTypeSchema(BaseModel):
+    """Schema for individual workflow types within workflow-based billing"""
+    workflow_name: str  # e.g., "Lead Research", "Cash Flow Forecast"
+    workflow_type: str  # e.g., "lead_research", "financial_forecast"
+    description: Optional[str] = None
+    price_per_workflow: float
     
-    # Activity-based config fields
-    activity_price_per_unit: Optional[float] = None
-    activity_activity_type: Optional[str] = None
-    activity_unit_type: Optional[str] = "action"
-    activity_base_agent_fee: Optional[float] = 0.0
-    activity_volume_pricing_enabled: Optional[bool] = False
-    activity_volume_tier_1_threshold: Optional[int] = None
-    activity_volume_tier_1_price: Optional[float] = None
-    activity_volume_tier_2_threshold: Optional[int] = None
-    activity_volume_tier_2_price: Optional[float] = None
-    activity_volume_tier_3_threshold: Optional[int] = None
-    activity_volume_tier_3_price: Optional[float] = None
-    activity_minimum_charge: Optional[float] = 0.0
-    activity_billing_frequency: Optional[str] = "monthly"
-    activity_is_active: Optional[bool] = True
-    activity_human_equivalent_value: Optional[float] = None
+    # Resource estimation
+    estimated_compute_cost: Optional[float] = 0.0
+    estimated_duration_minutes: Optional[int] = None
+    complexity_level: str = "medium"  # simple, medium, complex
     
-    # Outcome-based config fields
-    outcome_outcome_name: Optional[str] = None
-    outcome_outcome_type: Optional[str] = None
-    outcome_description: Optional[str] = None
-    outcome_base_platform_fee: Optional[float] = None
-    outcome_platform_fee_frequency: Optional[str] = None
-    outcome_percentage: Optional[float] = None
-    outcome_fixed_charge_per_outcome: Optional[float] = None
-    outcome_attribution_window_days: Optional[int] = None
-    outcome_minimum_attribution_value: Optional[float] = None
-    outcome_requires_verification: Optional[bool] = None
-    outcome_success_rate_assumption: Optional[float] = None
-    outcome_risk_premium_percentage: Optional[float] = None
-    outcome_monthly_cap_amount: Optional[float] = None
-    outcome_success_bonus_threshold: Optional[float] = None
-    outcome_success_bonus_percentage: Optional[float] = None
-    outcome_tier_1_threshold: Optional[float] = None
-    outcome_tier_1_percentage: Optional[float] = None
-    outcome_tier_2_threshold: Optional[float] = None
-    outcome_tier_2_percentage: Optional[float] = None
-    outcome_tier_3_threshold: Optional[float] = None
-    outcome_tier_3_percentage: Optional[float] = None
-    outcome_billing_frequency: Optional[str] = None
-    outcome_currency: Optional[str] = None
-    outcome_is_active: Optional[bool] = None
-    outcome_auto_bill_verified_outcomes: Optional[bool] = None
-    outcome_human_equivalent_value: Optional[float] = None
+    # Business value metrics
+    expected_roi_multiplier: Optional[float] = None
+    business_value_category: Optional[str] = None  # lead_generation, cost_savings, revenue_growth
     
-    # Workflow-based config fields
-    workflow_base_platform_fee: Optional[float] = None
-    workflow_platform_fee_frequency: Optional[str] = "monthly"
-    workflow_default_billing_frequency: Optional[str] = "monthly"
-    workflow_volume_discount_enabled: Optional[bool] = False
-    workflow_volume_discount_threshold: Optional[int] = None
-    workflow_volume_discount_percentage: Optional[float] = None
-    workflow_overage_multiplier: Optional[float] = 1.0
-    workflow_currency: Optional[str] = "USD"
-    workflow_is_active: Optional[bool] = True
-    workflow_human_equivalent_value: Optional[float] = None
-    workflow_types: Optional[List[WorkflowTypeSchema]] = None
-    commitment_tiers: Optional[List[CommitmentTierSchema]] = None
+    # Volume pricing tiers
+    volume_tier_1_threshold: Optional[int] = None
+    volume_tier_1_price: Optional[float] = None
+    volume_tier_2_threshold: Optional[int] = None
+    volume_tier_2_price: Optional[float] = None
+    volume_tier_3_threshold: Optional[int] = None
+    volume_tier_3_price: Optional[float] = None
+    
+    # Billing configuration
+    billing_frequency: Optional[str] = None  # If null, uses default from WorkflowBasedConfig
+    minimum_charge: Optional[float] = 0.0
+    is_active: bool = True
+    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per workflow
+    
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
 
 
-class BillingModelUpdate(BaseModel):
-    """Schema for updating billing models"""
-    name: Optional[str] = None
+class CommitmentTierSchema(BaseModel):
+    """Schema for commitment tiers in workflow-based billing"""
+    tier_name: str  # e.g., "Starter", "Growth", "Scale"
+    tier_level: int  # 1, 2, 3... for ordering
     description: Optional[str] = None
-    model_type: Optional[str] = Field(None, description="One of: 'agent', 'activity', 'outcome', 'workflow'")
-    is_active: Optional[bool] = None
     
+    # Commitment requirements
+    minimum_workflows_per_month: int
+    minimum_monthly_revenue: float
+    
+    # Included quantities
+    included_workflows: int = 0
+    included_workflow_types: Optional[str] = None  # JSON string of workflow types
+    
+    # Pricing benefits
+    discount_percentage: Optional[float] = 0.0
+    platform_fee_discount: Optional[float] = 0.0
+    
+    # Contract terms
+    commitment_period_months: int = 12
+    overage_rate_multiplier: float = 1.0
+    
+    # Status
+    is_active: bool = True
+    is_popular: bool = False
+    
+    class Config:
+        from_attributes = True
+        defer_build = True
+        frozen = True
+
+
+class BillingModelBase(BaseModel):
+    """Base billing model schema"""
+    name: str
+    description: Optional[str] = None
+    model_type: str = Field(..., description="One of: 'agent', 'activity', 'outcome', 'workflow'")
+    is_active: bool = True
+
+
+class BillingModelConfigFields(BaseModel):
+    """Flattened per-type config fields shared by create and update requests"""
     # Agent-based config fields
     agent_base_agent_fee: Optional[float] = None
     agent_billing_frequency: Optional[str] = None
@@ -163,6 +263,37 @@ class BillingModelUpdate(BaseModel):
     commitment_tiers: Optional[List[CommitmentTierSchema]] = None
 
 
+class BillingModelCreate(BillingModelConfigFields, BillingModelBase):
+    """Schema for creating billing models"""
+    organization_id: int
+    
+    # Defaults applied when the config row is created
+    agent_billing_frequency: Optional[str] = "monthly"
+    agent_setup_fee: Optional[float] = 0.0
+    agent_volume_discount_enabled: Optional[bool] = False
+    agent_tier: Optional[str] = "professional"
+    activity_unit_type: Optional[str] = "action"
+    activity_base_agent_fee: Optional[float] = 0.0
+    activity_volume_pricing_enabled: Optional[bool] = False
+    activity_minimum_charge: Optional[float] = 0.0
+    activity_billing_frequency: Optional[str] = "monthly"
+    activity_is_active: Optional[bool] = True
+    workflow_platform_fee_frequency: Optional[str] = "monthly"
+    workflow_default_billing_frequency: Optional[str] = "monthly"
+    workflow_volume_discount_enabled: Optional[bool] = False
+    workflow_overage_multiplier: Optional[float] = 1.0
+    workflow_currency: Optional[str] = "USD"
+    workflow_is_active: Optional[bool] = True
+
+
+class BillingModelUpdate(BillingModelConfigFields):
+    """Schema for updating billing models"""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    model_type: Optional[str] = Field(None, description="One of: 'agent', 'activity', 'outcome', 'workflow'")
+    is_active: Optional[bool] = None
+
+
 class BillingModelInDBBase(BillingModelBase):
     """Base schema for billing models in DB"""
     id: int
@@ -170,15 +301,17 @@ class BillingModelInDBBase(BillingModelBase):
     created_at: datetime
     updated_at: datetime
     # Nested config from dedicated tables - using the actual SQLAlchemy model names
-    agent_config: Optional["AgentBasedConfigSchema"] = None
-    activity_config: Optional[List["ActivityBasedConfigSchema"]] = None
-    outcome_config: Optional[List["OutcomeBasedConfigSchema"]] = None
-    workflow_config: Optional["WorkflowBasedConfigSchema"] = None
-    workflow_types: Optional[List["WorkflowTypeSchema"]] = None
-    commitment_tiers: Optional[List["CommitmentTierSchema"]] = None
+    # Read-only snapshots: tuples of frozen schemas, never mutated after load
+    agent_config: Optional[AgentBasedConfigSchema] = None
+    activity_config: Optional[Tuple[ActivityBasedConfigSchema, ...]] = None
+    outcome_config: Optional[Tuple[OutcomeBasedConfigSchema, ...]] = None
+    workflow_config: Optional[WorkflowBasedConfigSchema] = None
+    workflow_types: Optional[Tuple[WorkflowTypeSchema, ...]] = None
+    commitment_tiers: Optional[Tuple[CommitmentTierSchema, ...]] = None
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True  # Build the nested validator on first use, not at import
 
 
 class BillingModel(BillingModelInDBBase):
@@ -334,174 +467,6 @@ class BillingModel(BillingModelInDBBase):
             self.workflow_human_equivalent_value = cfg.human_equivalent_value
 
 
-# Specific configuration schemas for different billing types
-class AgentBasedConfigSchema(BaseModel):
-    """Configuration schema for agent-based billing"""
-    base_agent_fee: float
-    billing_frequency: str = "monthly"  # monthly, yearly
-    setup_fee: float = 0.0
-    volume_discount_enabled: bool = False
-    volume_discount_threshold: Optional[int] = None
-    volume_discount_percentage: Optional[float] = None
-    agent_tier: str = "professional"  # starter, professional, enterprise
-    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per agent
-    
-    class Config:
-        from_attributes = True
-
-class ActivityBasedConfigSchema(BaseModel):
-    """Configuration schema for enhanced activity-based billing"""
-    price_per_unit: float
-    activity_type: str  # api_call, query, completion, tokens, etc.
-    unit_type: str = "action"  # action, token, minute, request, etc.
-    base_agent_fee: float = 0.0  # Optional base fee per agent
-    volume_pricing_enabled: bool = False
-    volume_tier_1_threshold: Optional[int] = None
-    volume_tier_1_price: Optional[float] = None
-    volume_tier_2_threshold: Optional[int] = None
-    volume_tier_2_price: Optional[float] = None
-    volume_tier_3_threshold: Optional[int] = None
-    volume_tier_3_price: Optional[float] = None
-    minimum_charge: float = 0.0
-    billing_frequency: str = "monthly"  # monthly, daily, per_use
-    is_active: bool = True
-    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per unit
-    
-    class Config:
-        from_attributes = True
-
-
-class OutcomeBasedConfigSchema(BaseModel):
-    """Configuration schema for sophisticated outcome-based billing"""
-    # Outcome identification
-    outcome_name: str  # e.g., "Revenue Uplift", "Cost Savings"
-    outcome_type: str  # revenue_uplift, cost_savings, lead_generation, etc.
-    description: Optional[str] = None
-    
-    # Base platform fee (covers operational costs even if no success)
-    base_platform_fee: float = 0.0
-    platform_fee_frequency: str = "monthly"  # monthly, yearly
-    
-    # Primary outcome pricing
-    percentage: Optional[float] = None  # e.g., 5% of revenue uplift
-    fixed_charge_per_outcome: Optional[float] = None  # e.g., $10 per lead
-    
-    # Success attribution settings
-    attribution_window_days: int = 30  # How long to attribute outcomes
-    minimum_attribution_value: Optional[float] = None  # Minimum value to qualify for billing
-    requires_verification: bool = True  # Whether outcomes need verification
-    
-    # Risk adjustment and caps
-    success_rate_assumption: Optional[float] = None  # Expected success rate (e.g., 0.70 = 70%)
-    risk_premium_percentage: float = 40.0  # Risk premium (30-50%)
-    
-    # Performance caps and guarantees
-    monthly_cap_amount: Optional[float] = None  # Maximum billing per month
-    success_bonus_threshold: Optional[float] = None  # Value threshold for bonus
-    success_bonus_percentage: Optional[float] = None  # Additional percentage for exceeding threshold
-    
-    # Multi-tier outcome pricing
-    tier_1_threshold: Optional[float] = None  # First tier threshold
-    tier_1_percentage: Optional[float] = None  # Percentage for tier 1
-    tier_2_threshold: Optional[float] = None  # Second tier threshold
-    tier_2_percentage: Optional[float] = None  # Percentage for tier 2
-    tier_3_threshold: Optional[float] = None  # Third tier threshold
-    tier_3_percentage: Optional[float] = None  # Percentage for tier 3
-    
-    # Billing configuration
-    billing_frequency: str = "monthly"  # monthly, quarterly
-    currency: str = "USD"
-    
-    # Status and settings
-    is_active: bool = True
-    auto_bill_verified_outcomes: bool = False  # Auto-bill verified outcomes
-    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per outcome
-    
-    class Config:
-        from_attributes = True
-
-
-class WorkflowBasedConfigSchema(BaseModel):
-    """Configuration schema for workflow-based billing"""
-    base_platform_fee: float = 0.0
-    platform_fee_frequency: str = "monthly"  # monthly, yearly
-    default_billing_frequency: str = "monthly"
-    volume_discount_enabled: bool = False
-    volume_discount_threshold: Optional[int] = None
-    volume_discount_percentage: Optional[float] = None
-    overage_multiplier: float = 1.0
-    currency: str = "USD"
-    is_active: bool = True
-    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent for platform
-    
-    class Config:
-        from_attributes = True
-
-
-class WorkflowTypeSchema(BaseModel):
-    """Schema for individual workflow types within workflow-based billing"""
-    workflow_name: str  # e.g., "Lead Research", "Cash Flow Forecast"
-    workflow_type: str  # e.g., "lead_research", "financial_forecast"
-    description: Optional[str] = None
-    price_per_workflow: float
-    
-    # Resource estimation
-    estimated_compute_cost: Optional[float] = 0.0
-    estimated_duration_minutes: Optional[int] = None
-    complexity_level: str = "medium"  # simple, medium, complex
-    
-    # Business value metrics
-    expected_roi_multiplier: Optional[float] = None
-    business_value_category: Optional[str] = None  # lead_generation, cost_savings, revenue_growth
-    
-    # Volume pricing tiers
-    volume_tier_1_threshold: Optional[int] = None
-    volume_tier_1_price: Optional[float] = None
-    volume_tier_2_threshold: Optional[int] = None
-    volume_tier_2_price: Optional[float] = None
-    volume_tier_3_threshold: Optional[int] = None
-    volume_tier_3_price: Optional[float] = None
-    
-    # Billing configuration
-    billing_frequency: Optional[str] = None  # If null, uses default from WorkflowBasedConfig
-    minimum_charge: Optional[float] = 0.0
-    is_active: bool = True
-    human_equivalent_value: Optional[float] = 0.0  # Cost of human equivalent per workflow
-    
-    class Config:
-        from_attributes = True
-
-
-class CommitmentTierSchema(BaseModel):
-    """Schema for commitment tiers in workflow-based billing"""
-    tier_name: str  # e.g., "Starter", "Growth", "Scale"
-    tier_level: int  # 1, 2, 3... for ordering
-    description: Optional[str] = None
-    
-    # Commitment requirements
-    minimum_workflows_per_month: int
-    minimum_monthly_revenue: float
-    
-    # Included quantities
-    included_workflows: int = 0
-    included_workflow_types: Optional[str] = None  # JSON string of workflow types
-    
-    # Pricing benefits
-    discount_percentage: Optional[float] = 0.0
-    platform_fee_discount: Optional[float] = 0.0
-    
-    # Contract terms
-    commitment_period_months: int = 12
-    overage_rate_multiplier: float = 1.0
-    
-    # Status
-    is_active: bool = True
-    is_popular: bool = False
-    
-    class Config:
-        from_attributes = True
-
-
 class OutcomeMetricSchema(BaseModel):
     """Schema for outcome metrics tracking"""
     id: Optional[int] = None
@@ -535,6 +500,7 @@ class OutcomeMetricSchema(BaseModel):
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 class OutcomeVerificationRuleSchema(BaseModel):
@@ -557,6 +523,7 @@ class OutcomeVerificationRuleSchema(BaseModel):
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 class OutcomeMetricCreate(BaseModel):
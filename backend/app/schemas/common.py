@@ -0,0 +1,35 @@
+"""
+Shared field types for API schemas.
+"""
+from typing import Annotated, Any, Dict, List
+
+from pydantic import PlainValidator
+
+
+def _passthrough_object(value: Any) -> Dict[str, Any]:
+    """Accept a JSON object as-is without walking its contents"""
+    if not isinstance(value, dict):
+        raise ValueError("Input should be a valid dictionary")
+    return value
+
+
+def _passthrough_object_list(value: Any) -> List[Dict[str, Any]]:
+    """Accept a list of JSON objects as-is without walking each record"""
+    if not isinstance(value, list):
+        raise ValueError("Input should be a valid list")
+    return value
+
+
+# Free-form JSON payload (raw event data, metadata, configs). Only the top-level
+# type is checked; nested values are passed through untouched.
+JSONObject = Annotated[
+    Dict[str, Any],
+    PlainValidator(_passthrough_object, json_schema_input_type=Dict[str, Any]),
+]
+
+# Bulk list of free-form records (extracted rows, per-item results). Only the
+# list itself is checked so large payloads are not copied record by record.
+JSONObjectList = Annotated[
+    List[Dict[str, Any]],
+    PlainValidator(_passthrough_object_list, json_schema_input_type=List[Dict[str, Any]]),
+]
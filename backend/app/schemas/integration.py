@@ -2,13 +2,29 @@
 Pydantic schemas for integration layer endpoints.
 Provides request/response models for connectors, webhooks, events, and streams.
 """
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Optional, Dict, Any, List
+from pydantic import BaseModel, Field
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
+from app.schemas.common import JSONObject, JSONObjectList
 
-class ConnectorTypeEnum(str, Enum):
+
+# Patterns are defined once and shared by every field that uses them. They stay
+# Field(pattern=...) constraints, so pydantic-core checks them and "$" only
+# matches at the very end of the string.
+_IDENTIFIER_PATTERN = r'^[a-zA-Z0-9_-]+$'
+_URL_PATTERN = r'^https?://.+'
+_HTTP_METHOD_PATTERN = r'^(GET|POST|PUT|PATCH|DELETE)$'
+_BULK_OPERATION_PATTERN = r'^(test|start|stop|delete)$'
+
+Identifier = Annotated[str, Field(pattern=_IDENTIFIER_PATTERN)]
+WebhookUrl = Annotated[str, Field(pattern=_URL_PATTERN)]
+HttpMethod = Annotated[str, Field(pattern=_HTTP_METHOD_PATTERN)]
+BulkOperation = Annotated[str, Field(pattern=_BULK_OPERATION_PATTERN)]
+
+
+class ConnectorTypeEnum(StrEnum):
     """Supported connector types"""
     REST_API = "rest_api"
     GRAPHQL = "graphql"
@@ -17,7 +33,7 @@ class ConnectorTypeEnum(str, Enum):
     CUSTOM = "custom"
 
 
-class AuthTypeEnum(str, Enum):
+class AuthTypeEnum(StrEnum):
     """Supported authentication types"""
     NONE = "none"
     API_KEY = "api_key"
@@ -27,7 +43,7 @@ class AuthTypeEnum(str, Enum):
     CUSTOM = "custom"
 
 
-class ConnectorStatusEnum(str, Enum):
+class ConnectorStatusEnum(StrEnum):
     """Connector status options"""
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -101,13 +117,7 @@ class ConnectorBase(BaseModel):
 
 class ConnectorCreate(ConnectorBase):
     """Schema for creating connectors"""
-    connector_id: str = Field(..., min_length=1, max_length=255, pattern=r'^[a-zA-Z0-9_-]+$')
-    
-    @validator('connector_id')
-    def validate_connector_id(cls, v:str):
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Connector ID must contain only alphanumeric characters, underscores, and hyphens')
-        return v
+    connector_id: Identifier = Field(..., min_length=1, max_length=255)
 
 
 class ConnectorUpdate(BaseModel):
@@ -117,7 +127,7 @@ class ConnectorUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=1000)
     status: Optional[ConnectorStatusEnum] = None
     health_status: Optional[str] = None
-    metrics: Optional[Dict[str, Any]] = None
+    metrics: Optional[JSONObject] = None
 
 
 class ConnectorResponse(ConnectorBase):
@@ -128,12 +138,13 @@ class ConnectorResponse(ConnectorBase):
     status: ConnectorStatusEnum
     health_status: Optional[str] = None
     last_health_check: Optional[datetime] = None
-    metrics: Optional[Dict[str, Any]] = None
+    metrics: Optional[JSONObject] = None
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 class ConnectorDetailResponse(ConnectorResponse):
@@ -146,7 +157,7 @@ class ExtractionConfigSchema(BaseModel):
     """Data extraction configuration"""
     # REST API specific
     endpoint: Optional[str] = None
-    method: Optional[str] = Field(default="GET", pattern=r'^(GET|POST|PUT|PATCH|DELETE)$')
+    method: Optional[HttpMethod] = "GET"
     params: Optional[Dict[str, Any]] = None
     payload: Optional[Dict[str, Any]] = None
     data_path: Optional[str] = None
@@ -161,7 +172,7 @@ class ExtractionResponse(BaseModel):
     """Data extraction response"""
     connector_id: str
     records_extracted: int
-    data: List[Dict[str, Any]]
+    data: JSONObjectList
     extraction_time: datetime
     execution_time_ms: Optional[float] = None
 
@@ -172,8 +183,8 @@ class EventCreate(BaseModel):
     source_type: str = Field(..., max_length=50)
     source_id: str = Field(..., max_length=255)
     event_type: str = Field(..., max_length=50)
-    raw_data: Dict[str, Any]
-    processed_data: Optional[Dict[str, Any]] = None
+    raw_data: JSONObject
+    processed_data: Optional[JSONObject] = None
     agent_id: Optional[int] = None
 
 
@@ -184,28 +195,22 @@ class EventResponse(BaseModel):
     source_type: str
     source_id: str
     event_type: str
-    raw_data: Dict[str, Any]
-    processed_data: Optional[Dict[str, Any]]
+    raw_data: JSONObject
+    processed_data: Optional[JSONObject]
     agent_id: Optional[int]
     created_at: datetime
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 # Bulk operations
 class BulkOperationRequest(BaseModel):
     """Schema for bulk operations on connectors"""
-    operation: str = Field(..., pattern=r'^(test|start|stop|delete)$')
-    connector_ids: List[str] = Field(...)
-    
-    @validator('connector_ids')
-    def validate_connector_ids(cls, v):
-        if len(v) < 1:
-            raise ValueError('At least one connector ID is required')
-        if len(v) > 100:
-            raise ValueError('Maximum 100 connector IDs allowed')
-        return v
+    operation: BulkOperation
+    # Length bounds are enforced by pydantic-core, without a Python validator
+    connector_ids: List[str] = Field(..., min_length=1, max_length=100)
 
 
 class BulkOperationResponse(BaseModel):
@@ -214,14 +219,14 @@ class BulkOperationResponse(BaseModel):
     total_count: int
     successful_count: int
     failed_count: int
-    results: List[Dict[str, Any]]
+    results: JSONObjectList
 
 
 # Connector cloning
 class ConnectorCloneRequest(BaseModel):
     """Schema for cloning connectors"""
     source_connector_id: str = Field(..., min_length=1, max_length=255)
-    new_connector_id: str = Field(..., min_length=1, max_length=255, pattern=r'^[a-zA-Z0-9_-]+$')
+    new_connector_id: Identifier = Field(..., min_length=1, max_length=255)
     new_name: str = Field(..., min_length=1, max_length=255)
     config_overrides: Optional[Dict[str, Any]] = None
 
@@ -237,7 +242,7 @@ class ConnectorTemplate(BaseModel):
 
 
 # Webhook schemas (for future implementation)
-class WebhookEventType(str, Enum):
+class WebhookEventType(StrEnum):
     """Supported webhook event types"""
     AGENT_ACTIVITY = "agent.activity"
     AGENT_COST = "agent.cost"  
@@ -247,7 +252,7 @@ class WebhookEventType(str, Enum):
     SYSTEM_HEALTH = "system.health"
 
 
-class WebhookStatus(str, Enum):
+class WebhookStatus(StrEnum):
     """Webhook status options"""
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -264,7 +269,7 @@ class RetryConfigSchema(BaseModel):
 class WebhookBase(BaseModel):
     """Base webhook schema"""
     name: str = Field(..., min_length=1, max_length=255)
-    url: str = Field(..., pattern=r'^https?://.+')
+    url: WebhookUrl
     event_types: List[WebhookEventType]
     description: Optional[str] = Field(None, max_length=1000)
     retry_config: Optional[RetryConfigSchema] = None
@@ -272,13 +277,13 @@ class WebhookBase(BaseModel):
 
 class WebhookCreate(WebhookBase):
     """Schema for creating webhooks"""
-    endpoint_id: str = Field(..., min_length=1, max_length=255, pattern=r'^[a-zA-Z0-9_-]+$')
+    endpoint_id: Identifier = Field(..., min_length=1, max_length=255)
 
 
 class WebhookUpdate(BaseModel):
     """Schema for updating webhooks"""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
-    url: Optional[str] = Field(None, pattern=r'^https?://.+')
+    url: Optional[WebhookUrl] = None
     event_types: Optional[List[WebhookEventType]] = None
     description: Optional[str] = Field(None, max_length=1000)
     retry_config: Optional[RetryConfigSchema] = None
@@ -296,15 +301,16 @@ class WebhookResponse(WebhookBase):
     
     class Config:
         from_attributes = True
+        defer_build = True
 
 
 # Stream schemas (for future implementation)
 class StreamCreate(BaseModel):
     """Schema for creating stream consumers"""
-    stream_id: str = Field(..., min_length=1, max_length=255, pattern=r'^[a-zA-Z0-9_-]+$')
+    stream_id: Identifier = Field(..., min_length=1, max_length=255)
     name: str = Field(..., min_length=1, max_length=255)
-    source_config: Dict[str, Any]
-    processing_config: Optional[Dict[str, Any]] = None
+    source_config: JSONObject
+    processing_config: Optional[JSONObject] = None
     description: Optional[str] = Field(None, max_length=1000)
 
 
@@ -314,8 +320,8 @@ class StreamResponse(BaseModel):
     stream_id: str
     organization_id: int
     name: str
-    source_config: Dict[str, Any]
-    processing_config: Optional[Dict[str, Any]]
+    source_config: JSONObject
+    processing_config: Optional[JSONObject]
     status: str
     description: Optional[str]
     created_at: datetime
@@ -323,3 +329,4 @@ class StreamResponse(BaseModel):
     
     class Config:
         from_attributes = True
+        defer_build = True
@@ -1,7 +1,9 @@
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from typing import Optional, List
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas.common import JSONObject
+
 
 class InvoiceLineItemBase(BaseModel):
     """Base invoice line item schema"""
@@ -12,7 +14,7 @@ class InvoiceLineItemBase(BaseModel):
     item_type: str  # subscription, usage, outcome
     reference_id: Optional[int] = None
     reference_type: Optional[str] = None
-    item_metadata: Optional[Dict[str, Any]] = None
+    item_metadata: Optional[JSONObject] = None
 
 
 class InvoiceLineItemCreate(InvoiceLineItemBase):
@@ -20,8 +22,8 @@ class InvoiceLineItemCreate(InvoiceLineItemBase):
     pass
 
 
-class InvoiceLineItemInDB(InvoiceLineItemBase):
-    """Schema for invoice line items in DB"""
+class InvoiceLineItem(InvoiceLineItemBase):
+    """Schema for invoice line item responses"""
     id: int
     invoice_id: int
     created_at: datetime
@@ -29,11 +31,10 @@ class InvoiceLineItemInDB(InvoiceLineItemBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
-class InvoiceLineItem(InvoiceLineItemInDB):
-    """Schema for invoice line item responses"""
-    pass
+InvoiceLineItemInDB = InvoiceLineItem
 
 
 class InvoiceBase(BaseModel):
@@ -46,7 +47,7 @@ class InvoiceBase(BaseModel):
     currency: str = "USD"
     status: str = "pending"
     notes: Optional[str] = None
-    invoice_metadata: Optional[Dict[str, Any]] = None
+    invoice_metadata: Optional[JSONObject] = None
 
 
 class InvoiceCreate(BaseModel):
@@ -55,7 +56,7 @@ class InvoiceCreate(BaseModel):
     due_date: datetime
     items: List[InvoiceLineItemCreate]
     notes: Optional[str] = None
-    invoice_metadata: Optional[Dict[str, Any]] = None
+    invoice_metadata: Optional[JSONObject] = None
     
     # Optional fields that can be auto-generated
     invoice_number: Optional[str] = None
@@ -68,7 +69,7 @@ class InvoiceUpdate(BaseModel):
     payment_method: Optional[str] = None
     payment_date: Optional[datetime] = None
     notes: Optional[str] = None
-    invoice_metadata: Optional[Dict[str, Any]] = None
+    invoice_metadata: Optional[JSONObject] = None
 
 
 class InvoicePayment(BaseModel):
@@ -77,8 +78,8 @@ class InvoicePayment(BaseModel):
     payment_date: Optional[datetime] = None
 
 
-class InvoiceInDB(InvoiceBase):
-    """Schema for invoices in DB"""
+class Invoice(InvoiceBase):
+    """Schema for invoice responses"""
     id: int
     organization_id: int
     issue_date: datetime
@@ -92,13 +93,12 @@ class InvoiceInDB(InvoiceBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
-class Invoice(InvoiceInDB):
-    """Schema for invoice responses"""
-    pass
+InvoiceInDB = Invoice
 
 
 class InvoiceWithItems(Invoice):
     """Invoice schema with line items"""
-    line_items: List[InvoiceLineItem] = []
\ No newline at end of file
+    line_items: List[InvoiceLineItem] = Field(default_factory=list)
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import Optional, List, Dict
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas.common import JSONObject
+
 
 class OrganizationBase(BaseModel):
     """Base organization schema"""
@@ -14,7 +16,7 @@ class OrganizationBase(BaseModel):
     contact_name: Optional[str] = None
     contact_phone: Optional[str] = None
     timezone: str = 'UTC'
-    settings: Dict = {}
+    settings: JSONObject = Field(default_factory=dict)
 
 
 class OrganizationCreate(OrganizationBase):
@@ -32,11 +34,11 @@ class OrganizationUpdate(BaseModel):
     contact_name: Optional[str] = None
     contact_phone: Optional[str] = None
     timezone: Optional[str] = None
-    settings: Optional[Dict] = None
+    settings: Optional[JSONObject] = None
 
 
-class OrganizationInDBBase(OrganizationBase):
-    """Base schema for organizations in DB"""
+class Organization(OrganizationBase):
+    """Schema for organization responses"""
     id: int
     created_at: datetime
     updated_at: datetime
@@ -44,11 +46,10 @@ class OrganizationInDBBase(OrganizationBase):
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
-class Organization(OrganizationInDBBase):
-    """Schema for organization responses"""
-    pass
+OrganizationInDBBase = Organization
 
 
 class OrganizationWithStats(Organization):
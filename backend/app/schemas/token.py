@@ -1,4 +1,5 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 from pydantic import BaseModel
 
 
@@ -8,7 +9,19 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
-class TokenPayload(BaseModel):
-    """Schema for JWT token payload"""
+@dataclass(slots=True, frozen=True)
+class TokenPayload:
+    """Decoded JWT payload, built on every authenticated request"""
     sub: Optional[str] = None
-    exp: Optional[int] = None
\ No newline at end of file
+    exp: Optional[int] = None
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "TokenPayload":
+        """Build from decoded JWT claims, ignoring claims we don't use"""
+        sub = claims.get("sub")
+        exp = claims.get("exp")
+        if sub is not None and not isinstance(sub, str):
+            raise ValueError("Token subject must be a string")
+        if exp is not None and not isinstance(exp, int):
+            raise ValueError("Token expiry must be an integer")
+        return cls(sub=sub, exp=exp)
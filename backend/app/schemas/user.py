@@ -5,7 +5,9 @@ from datetime import datetime
 
 class UserBase(BaseModel):
     """Base user schema with common attributes"""
-    email: EmailStr
+    # Full address validation happens on write (UserCreate / UserUpdate); values
+    # read back from the database are already canonical.
+    email: str
     full_name: Optional[str] = None
     is_active: Optional[bool] = True
     is_superuser: bool = False
@@ -14,6 +16,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """Schema for creating a new user"""
+    email: EmailStr
     password: str
     organization_id: Optional[int] = None
 
@@ -28,21 +31,20 @@ class UserUpdate(BaseModel):
     role: Optional[str] = None
 
 
-class UserInDBBase(UserBase):
-    """Base schema for users in DB, includes ID"""
+class User(UserBase):
+    """Schema for user responses"""
     id: int
     organization_id: Optional[int] = None
     last_login: Optional[datetime] = None  # New field from revised schema
     
     class Config:
         from_attributes = True  # Updated from orm_mode = True for Pydantic v2 compatibility
+        defer_build = True
 
 
-class User(UserInDBBase):
-    """Schema for user responses"""
-    pass
+UserInDBBase = User
 
 
-class UserInDB(UserInDBBase):
+class UserInDB(User):
     """Schema for user in DB with hashed password"""
     hashed_password: str
\ No newline at end of file
@@ -12,7 +12,8 @@ from .core import (
 )
 
 from .activity import (
-    record_agent_activity
+    record_agent_activity,
+    record_agent_activities
 )
 
 from .cost import (
@@ -50,6 +51,7 @@ __all__ = [
     
     # Activity operations
     "record_agent_activity",
+    "record_agent_activities",
     
     # Cost operations
     "record_agent_cost",
@@ -3,13 +3,16 @@ Activity operations for agents.
 """
 
 import logging
+from types import SimpleNamespace
+from typing import List
 from datetime import datetime, timezone
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
-from app.models.agent import AgentActivity as AgentActivityModel, AgentCost as AgentCostModel
+from app.models.agent import Agent, AgentActivity as AgentActivityModel, AgentCost as AgentCostModel
 from app.schemas.agent import AgentActivityCreate
-from app.services.billing_model.calculation import calculate_cost
-from .core import get_agent
+from .billing import get_agent_billing_plan
+from .stats_cache import invalidate_agent_stats
 
 logger = logging.getLogger(__name__)
 
@@ -19,78 +22,121 @@ def record_agent_activity(db: Session, activity_in: AgentActivityCreate) -> Agen
     Record an activity for an agent
     """
     # Check if agent exists
-    agent = get_agent(db, agent_id=activity_in.agent_id)
-    if not agent:
+    plan = get_agent_billing_plan(db, agent_id=activity_in.agent_id)
+    if not plan:
         raise ValueError(f"Agent with ID {activity_in.agent_id} not found")
+    return _record_activities_with_cost(db, plan, [activity_in])[0]
+
+
+def record_agent_activities(
+    db: Session, agent_id: int, activities_in: List[AgentActivityCreate]
+) -> List[AgentActivityModel]:
+    """
+    Record a batch of activities for an agent in one transaction
+
+    Activities and their auto-recorded costs are each written with a single
+    multi-row INSERT, so a batch costs the same round-trips as one event.
+    """
+    if any(activity_in.agent_id != agent_id for activity_in in activities_in):
+        raise ValueError("All activities in a batch must belong to the same agent")
     
-    # Create activity
-    activity = AgentActivityModel(
-        agent_id=activity_in.agent_id,
-        activity_type=activity_in.activity_type,
-        timestamp=datetime.now(timezone.utc),
-        activity_metadata=activity_in.activity_metadata,
-    )
+    # Check if agent exists
+    plan = get_agent_billing_plan(db, agent_id=agent_id)
+    if not plan:
+        raise ValueError(f"Agent with ID {agent_id} not found")
+    if not activities_in:
+        return []
+    return _record_activities_with_cost(db, plan, activities_in)
+
+
+def _record_activities_with_cost(
+    db: Session, plan: SimpleNamespace, activities_in: List[AgentActivityCreate]
+) -> List[AgentActivityModel]:
+    """
+    Insert activities and their auto-recorded costs for an agent's billing plan
+
+    The plan comes from get_agent_billing_plan, so on a cache hit nothing is
+    read before the INSERT.
+    """
+    agent_id = plan.agent_id
+
+    # One timestamp for the records, their cost entries and last_active
+    now = datetime.now(timezone.utc)
+
+    # Create activities; RETURNING hands back the hydrated rows in the same round-trip
+    stmt = insert(AgentActivityModel).returning(AgentActivityModel, sort_by_parameter_order=True)
+    touch_in_insert = db.get_bind().dialect.name == "postgresql"
+    if touch_in_insert:
+        # Update last_active from a data-modifying CTE so it rides on the INSERT
+        stmt = stmt.add_cte(
+            update(Agent.__table__)
+            .where(Agent.__table__.c.id == agent_id)
+            .values(last_active=now, updated_at=now)
+            .cte("touch_agent")
+        )
+    activities = db.scalars(
+        stmt,
+        [
+            dict(
+                agent_id=agent_id,
+                activity_type=activity_in.activity_type,
+                timestamp=now,
+                activity_metadata=activity_in.activity_metadata,
+            )
+            for activity_in in activities_in
+        ],
+    ).all()
     
-    # Add activity to database
-    db.add(activity)
-    db.commit()
-    db.refresh(activity)
-    # Update agent's last active timestamp
-    setattr(agent, 'last_active', datetime.now(timezone.utc))
-    db.commit()
+    # Update agent's last active timestamp with a targeted UPDATE
+    if not touch_in_insert:
+        db.execute(update(Agent).where(Agent.id == agent_id).values(last_active=now))
 
-    logger.info(f"Recorded activity {activity.activity_type} for agent: {agent.name}")
+    logger.info(f"Recorded {len(activities)} activities for agent: {plan.agent_name}")
     # Auto-record cost for activity based on billing model
-    bm = agent.billing_model
-    if bm and bm.model_type == "activity":
-        # For activity-based billing, use activity_type from the config
-        if bm.model_type == "activity":
+    if plan.model_type == "activity":
+        cost_fn = plan.cost_fn
+        configs_by_type = plan.configs_by_type
+        costs_by_type = {}
+        cost_rows = []
+        for activity in activities:
             # Find matching activity config based on activity_type
-            activity_configs = bm.activity_config or []
-            matching_config = None
-            for cfg in activity_configs:
-                if cfg.activity_type == activity.activity_type:
-                    matching_config = cfg
-                    break
+            matching_config = configs_by_type.get(activity.activity_type)
+            if not matching_config:
+                logger.warning(f"No matching activity config found for activity type: {activity.activity_type}")
+                continue
             
-            if matching_config:
-                # Use specific activity config for calculation
+            # Every activity of a type costs the same single unit
+            cost_amt = costs_by_type.get(activity.activity_type)
+            if cost_amt is None:
                 usage_data = {"units": 1, "activity_type": activity.activity_type}
-                cost_amt = calculate_cost(bm, usage_data)
-                
-                # Create cost entry with enhanced details
-                cost_entry = AgentCostModel(
-                    agent_id=agent.id,
-                    cost_type="activity",
-                    amount=cost_amt,
-                    currency="USD",
-                    timestamp=datetime.now(timezone.utc),
-                    details={
-                        "activity_id": activity.id, 
-                        "activity_type": activity.activity_type,
-                        "unit_type": matching_config.unit_type,
-                        "price_per_unit": matching_config.price_per_unit,
-                        "volume_pricing_enabled": matching_config.volume_pricing_enabled,
-                        "billing_frequency": matching_config.billing_frequency
-                    }
-                )
-                db.add(cost_entry)
-                db.commit()
-                logger.info(f"Auto-recorded activity cost {cost_amt} USD for agent: {agent.name}")
-            else:
-                logger.warning(f"No matching activity config found for activity type: {activity.activity_type}")
-        else:
-            logger.warning(f"Unsupported model type for activity tracking: {bm.model_type}")
+                cost_amt = costs_by_type[activity.activity_type] = cost_fn(usage_data)
             
-            cost_entry = AgentCostModel(
-                agent_id=agent.id,
+            # Create cost entry with enhanced details
+            cost_rows.append(dict(
+                agent_id=agent_id,
                 cost_type="activity",
-                amount=0.0,
+                amount=cost_amt,
                 currency="USD",
-                timestamp=datetime.now(timezone.utc),
-                details={"activity_id": activity.id, "activity_type": activity.activity_type}
-            )
-            db.add(cost_entry)
-            db.commit()
-            logger.info(f"Auto-recorded activity cost 0.0 USD for agent: {agent.name}")
-    return activity
+                timestamp=now,
+                details={
+                    "activity_id": activity.id, 
+                    "activity_type": activity.activity_type,
+                    "unit_type": matching_config.unit_type,
+                    "price_per_unit": matching_config.price_per_unit,
+                    "volume_pricing_enabled": matching_config.volume_pricing_enabled,
+                    "billing_frequency": matching_config.billing_frequency
+                }
+            ))
+        
+        if cost_rows:
+            # Core executemany: cost rows are write-only, so skip the ORM entirely
+            db.execute(insert(AgentCostModel.__table__), cost_rows)
+            logger.info(f"Auto-recorded {len(cost_rows)} activity costs for agent: {plan.agent_name}")
+
+    # RETURNING already populated the rows; detach them so commit doesn't expire
+    # them and force a refresh SELECT
+    for activity in activities:
+        db.expunge(activity)
+    db.commit()
+    invalidate_agent_stats(agent_id)
+    return activities
@@ -2,158 +2,185 @@
 Billing operations for agents.
 """
 
-from typing import Dict, Any, Optional
+from types import SimpleNamespace
+from typing import Dict, Any, FrozenSet, Optional
+from sqlalchemy import exists, lambda_stmt, select
 from sqlalchemy.orm import Session
 
-from app.services.billing_model.calculation import calculate_cost
+from app.models.agent import Agent
+from app.models.billing_model import BillingModel, ActivityBasedConfig, OutcomeBasedConfig, WorkflowType
+from app.services.billing_model.calculation import calculate_workflow_cost_breakdown, freeze_row, get_cost_fn
+from app.services.billing_model.snapshot import build_config_snapshot
+from .billing_cache import (
+    get_cached_billing_config,
+    get_cached_config_type_sets,
+    set_cached_billing_config,
+    get_cached_billing_plan,
+    set_cached_billing_plan,
+    invalidate_billing_config,
+)
 from .core import get_agent
 
+# Per data type: the key carrying the type in the payload, the list it is
+# found under in a billing config, the set of configured types cached alongside
+# the config, and the config column it must match
+_CONFIG_TYPE_LOOKUPS = {
+    "activity": ("activity_type", "activity_configs", "activity_type_set", ActivityBasedConfig.activity_type),
+    "outcome": ("outcome_type", "outcome_configs", "outcome_type_set", OutcomeBasedConfig.outcome_type),
+    "workflow": ("workflow_type", "workflow_types", "workflow_type_set", WorkflowType.workflow_type),
+}
+
+# Per model type, the BillingModel property indexing its configs by type
+_CONFIGS_BY_TYPE = {
+    "activity": "activity_config_by_type",
+    "outcome": "outcome_config_by_type",
+    "workflow": "workflow_types_by_type",
+}
+
+
+def _config_type_sets(config: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """
+    Build the set of configured types of each config list for O(1) membership checks
+
+    The sets are cached next to the config rather than inside it, so the config
+    returned to API callers keeps its documented shape.
+    """
+    return {
+        set_key: frozenset(cfg[type_key] for cfg in config[config_key])
+        for type_key, config_key, set_key, _ in _CONFIG_TYPE_LOOKUPS.values()
+        if config_key in config
+    }
+
+
 def get_agent_billing_config(db: Session, agent_id: int) -> Optional[Dict[str, Any]]:
     """
     Get the billing configuration for an agent
+
+    Reads the snapshot stored on the billing model, falling back to building it
+    from the config rows for models written before snapshots existed. The result
+    is cached per agent and shared between callers; treat it as read-only.
     """
+    config = get_cached_billing_config(agent_id)
+    if config is not None:
+        return config
+
+    row = (
+        db.query(BillingModel.config_snapshot)
+        .join(Agent, Agent.billing_model_id == BillingModel.id)
+        .filter(Agent.id == agent_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    config = row.config_snapshot
+    if config is None:
+        agent = get_agent(db, agent_id=agent_id, with_billing=True)
+        config = build_config_snapshot(agent.billing_model)
+
+    set_cached_billing_config(agent_id, config, _config_type_sets(config))
+    return config
+
+
+def _get_billing_plan_version(db: Session, agent_id: int):
+    """
+    Get the agent's billing model ID and updated_at, or None if the agent is gone
+    """
+    stmt = lambda_stmt(lambda: (
+        select(Agent.billing_model_id, BillingModel.updated_at)
+        .outerjoin(BillingModel, BillingModel.id == Agent.billing_model_id)
+        .where(Agent.id == agent_id)
+    ))
+    return db.execute(stmt).first()
+
+
+def get_agent_billing_plan(db: Session, agent_id: int) -> Optional[SimpleNamespace]:
+    """
+    Get the frozen billing plan used when recording usage for an agent
+
+    Holds the agent's name, its billing model type and compiled cost function,
+    and the configs for that model type keyed by type. Nothing in it is bound
+    to a session, so it is cached per agent and shared between requests. A
+    cached plan is only used after one indexed read confirms the agent still
+    exists and its billing model is the version the plan was built from, so
+    deleted agents and price changes made by other workers are seen at once.
+    """
+    plan = get_cached_billing_plan(agent_id)
+    if plan is not None:
+        version = _get_billing_plan_version(db, agent_id)
+        if version is None:
+            invalidate_billing_config(agent_id)
+            return None
+        if tuple(version) == plan.version:
+            return plan
+
     agent = get_agent(db, agent_id=agent_id)
-    if not agent or not agent.billing_model:
+    if not agent:
         return None
-    
+
     bm = agent.billing_model
-    config = {
-        "model_type": bm.model_type,
-        "model_id": bm.id,
-        "model_name": bm.name,
-        "is_active": bm.is_active
-    }
-    
-    # Add type-specific config
-    if bm.model_type == "agent" and bm.agent_config:
-        config["agent_config"] = {
-            "base_agent_fee": bm.agent_config.base_agent_fee,
-            "billing_frequency": bm.agent_config.billing_frequency,
-            "agent_tier": bm.agent_config.agent_tier
-        }
-    elif bm.model_type == "activity" and bm.activity_config:
-        config["activity_configs"] = [
-            {
-                "activity_type": cfg.activity_type,
-                "price_per_unit": cfg.price_per_unit,
-                "unit_type": cfg.unit_type,
-                "is_active": cfg.is_active
-            } for cfg in bm.activity_config
-        ]
-    elif bm.model_type == "outcome" and bm.outcome_config:
-        config["outcome_configs"] = [
-            {
-                "outcome_type": cfg.outcome_type,
-                "outcome_name": cfg.outcome_name,
-                "percentage": cfg.percentage,
-                "requires_verification": cfg.requires_verification,
-                "is_active": cfg.is_active
-            } for cfg in bm.outcome_config
-        ]
-    elif bm.model_type == "workflow" and bm.workflow_types:
-        config["workflow_config"] = {
-            "base_platform_fee": bm.workflow_config.base_platform_fee,
-            "platform_fee_frequency": bm.workflow_config.platform_fee_frequency,
-            "default_billing_frequency": bm.workflow_config.default_billing_frequency,
-            "currency": bm.workflow_config.currency,
-            "volume_discount_enabled": bm.workflow_config.volume_discount_enabled,
-            "volume_discount_threshold": bm.workflow_config.volume_discount_threshold,
-            "volume_discount_percentage": bm.workflow_config.volume_discount_percentage,
-            "overage_multiplier": bm.workflow_config.overage_multiplier,
-            "is_active": bm.workflow_config.is_active
-        }
-        config["workflow_types"] = [
-            {
-                "workflow_type": wt.workflow_type,
-                "workflow_name": wt.workflow_name,
-                "description": wt.description,
-                "price_per_workflow": wt.price_per_workflow,
-                "complexity_level": wt.complexity_level,
-                "estimated_compute_cost": wt.estimated_compute_cost,
-                "estimated_duration_minutes": wt.estimated_duration_minutes,
-                "expected_roi_multiplier": wt.expected_roi_multiplier,
-                "business_value_category": wt.business_value_category,
-                "volume_tier_1_threshold": wt.volume_tier_1_threshold,
-                "volume_tier_1_price": wt.volume_tier_1_price,
-                "volume_tier_2_threshold": wt.volume_tier_2_threshold,
-                "volume_tier_2_price": wt.volume_tier_2_price,
-                "volume_tier_3_threshold": wt.volume_tier_3_threshold,
-                "volume_tier_3_price": wt.volume_tier_3_price,
-                "billing_frequency": wt.billing_frequency,
-                "minimum_charge": wt.minimum_charge,
-                "is_active": wt.is_active
-            } for wt in bm.workflow_types
-        ]
-        if bm.commitment_tiers:
-            config["commitment_tiers"] = [
-                {
-                    "tier_name": ct.tier_name,
-                    "tier_level": ct.tier_level,
-                    "description": ct.description,
-                    "minimum_workflows_per_month": ct.minimum_workflows_per_month,
-                    "minimum_monthly_revenue": ct.minimum_monthly_revenue,
-                    "included_workflows": ct.included_workflows,
-                    "included_workflow_types": ct.included_workflow_types,
-                    "discount_percentage": ct.discount_percentage,
-                    "platform_fee_discount": ct.platform_fee_discount,
-                    "commitment_period_months": ct.commitment_period_months,
-                    "overage_rate_multiplier": ct.overage_rate_multiplier,
-                    "is_active": ct.is_active,
-                    "is_popular": ct.is_popular
-                } for ct in bm.commitment_tiers
-            ]
-    
-    return config
+    configs_by_type = {}
+    if bm and bm.model_type in _CONFIGS_BY_TYPE:
+        configs = getattr(bm, _CONFIGS_BY_TYPE[bm.model_type])
+        configs_by_type = {config_type: freeze_row(cfg) for config_type, cfg in configs.items()}
+    plan = SimpleNamespace(
+        agent_id=agent_id,
+        agent_name=agent.name,
+        version=(agent.billing_model_id, bm.updated_at if bm else None),
+        model_type=bm.model_type if bm else None,
+        cost_fn=get_cost_fn(bm) if bm else None,
+        configs_by_type=configs_by_type,
+    )
+    set_cached_billing_plan(agent_id, plan)
+    return plan
 
 
-def validate_agent_billing_data(db: Session, agent_id: int, data_type: str, data: Dict[str, Any]) -> bool:
+def _agent_has_config_type(db: Session, agent_id: int, data_type: str, type_column, type_value: str) -> bool:
+    """
+    Check with a single EXISTS query whether the agent's billing model configures a type
+    """
+    config_model = type_column.class_
+    return db.query(
+        exists()
+        .where(Agent.id == agent_id)
+        .where(BillingModel.id == Agent.billing_model_id)
+        .where(BillingModel.model_type == data_type)
+        .where(config_model.billing_model_id == BillingModel.id)
+        .where(type_column == type_value)
+    ).scalar()
+
+
+def validate_agent_billing_data(
+    db: Session,
+    agent_id: int,
+    data_type: str,
+    data: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+) -> bool:
     """
     Validate that billing data matches the agent's billing model configuration
+
+    Callers that already hold the agent's billing config can pass it; otherwise
+    the check runs as one EXISTS query without building the config.
     """
-    config = get_agent_billing_config(db, agent_id)
-    if not config:
+    lookup = _CONFIG_TYPE_LOOKUPS.get(data_type)
+    if lookup is None:
         return False
+    type_key, config_key, set_key, type_column = lookup
     
-    model_type = config["model_type"]
-    
-    if data_type == "activity":
-        if model_type != "activity":
-            return False
-        
-        activity_type = data.get("activity_type")
-        if not activity_type:
-            return False
-        
-        # Check if activity type is configured
-        activity_configs = config.get("activity_configs", [])
-        return any(cfg["activity_type"] == activity_type for cfg in activity_configs)
-    
-    elif data_type == "outcome":
-        if model_type != "outcome":
-            return False
-        
-        outcome_type = data.get("outcome_type")
-        if not outcome_type:
-            return False
-        
-        # Check if outcome type is configured
-        if model_type == "outcome":
-            outcome_configs = config.get("outcome_configs", [])
-            return any(cfg["outcome_type"] == outcome_type for cfg in outcome_configs)
+    type_value = data.get(type_key)
+    if not type_value:
+        return False
     
-    elif data_type == "workflow":
-        if model_type != "workflow":
-            return False
-        
-        workflow_type = data.get("workflow_type")
-        if not workflow_type:
-            return False
-        
-        # Check if workflow type is configured
-        workflow_types = config.get("workflow_types", [])
-        return any(wt["workflow_type"] == workflow_type for wt in workflow_types)
+    if config is None:
+        return _agent_has_config_type(db, agent_id, data_type, type_column, type_value)
     
-    return False
+    if config.get("model_type") != data_type:
+        return False
+    type_set = (get_cached_config_type_sets(agent_id, config) or {}).get(set_key)
+    if type_set is None:
+        type_set = {cfg[type_key] for cfg in config.get(config_key, [])}
+    return type_value in type_set
 
 
 def validate_workflow_billing_data(db: Session, agent_id: int, workflow_executions: Dict[str, int]) -> Dict[str, Any]:
@@ -168,7 +195,7 @@ def validate_workflow_billing_data(db: Session, agent_id: int, workflow_executio
         Dictionary with validation results
     """
     # Check if agent exists
-    agent = get_agent(db, agent_id=agent_id)
+    agent = get_agent(db, agent_id=agent_id, with_billing=True)
     if not agent:
         return {"valid": False, "error": f"Agent with ID {agent_id} not found"}
     
@@ -185,12 +212,28 @@ def validate_workflow_billing_data(db: Session, agent_id: int, workflow_executio
         "total_estimated_cost": 0.0
     }
     
+    wt_by_type = bm.workflow_types_by_type
     configured_workflow_types = {wt.workflow_type for wt in bm.workflow_types if wt.is_active}
     
+    # Price every configured workflow type in one pass
+    configured_executions = {
+        wf: count for wf, count in workflow_executions.items() if wf in configured_workflow_types
+    }
+    cost_error = None
+    workflow_costs: Dict[str, float] = {}
+    if configured_executions:
+        try:
+            total_cost, workflow_costs = calculate_workflow_cost_breakdown(
+                bm, {"workflows": configured_executions}
+            )
+            validation_results["total_estimated_cost"] = total_cost
+        except Exception as e:
+            cost_error = f"Failed to calculate cost: {str(e)}"
+    
     for workflow_type, count in workflow_executions.items():
         workflow_validation = {
             "valid": True,
-            "configured": workflow_type in configured_workflow_types,
+            "configured": workflow_type in configured_executions,
             "count": count,
             "estimated_cost": 0.0
         }
@@ -199,25 +242,20 @@ def validate_workflow_billing_data(db: Session, agent_id: int, workflow_executio
             workflow_validation["valid"] = False
             workflow_validation["error"] = f"Workflow type '{workflow_type}' is not configured for this agent"
             validation_results["valid"] = False
+        elif cost_error:
+            workflow_validation["valid"] = False
+            workflow_validation["error"] = cost_error
+            validation_results["valid"] = False
         else:
-            # Calculate estimated cost
-            try:
-                usage_data = {"workflows": {workflow_type: count}}
-                estimated_cost = calculate_cost(bm, usage_data)
-                workflow_validation["estimated_cost"] = estimated_cost
-                validation_results["total_estimated_cost"] += estimated_cost
-            except Exception as e:
-                workflow_validation["valid"] = False
-                workflow_validation["error"] = f"Failed to calculate cost: {str(e)}"
-                validation_results["valid"] = False
+            workflow_validation["estimated_cost"] = workflow_costs.get(workflow_type, 0.0)
         
         validation_results["workflow_validations"][workflow_type] = workflow_validation
     
     # Add warnings for inactive workflow types
     for workflow_type in workflow_executions.keys():
         if workflow_type in configured_workflow_types:
-            workflow_config = next((wt for wt in bm.workflow_types if wt.workflow_type == workflow_type), None)
-            if workflow_config and not workflow_config.is_active:
+            workflow_config = wt_by_type[workflow_type]
+            if not workflow_config.is_active:
                 validation_results["warnings"].append(f"Workflow type '{workflow_type}' is configured but not active")
     
     return validation_results
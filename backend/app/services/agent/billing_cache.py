@@ -0,0 +1,92 @@
+"""
+In-process caches for agent billing configs.
+
+Billing configs change rarely compared with how often they are read, so the
+dict built by get_agent_billing_config (with the sets of configured types used
+to validate against it) and the billing plan used when recording usage are
+kept for a short TTL. Entries are dropped when an agent or billing model is
+written; the TTL bounds staleness across worker processes. Billing plans are
+also checked against the agent's billing model version on every use.
+"""
+
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+BILLING_CONFIG_TTL_SECONDS = 60.0
+BILLING_CONFIG_CACHE_SIZE = 10_000
+BILLING_PLAN_TTL_SECONDS = 30.0
+
+# agent_id -> (expires_at, config, configured types per config list)
+_cache: Dict[int, Tuple[float, Dict[str, Any], Dict[str, FrozenSet[str]]]] = {}
+_plans: Dict[int, Tuple[float, Any]] = {}
+
+
+def get_cached_billing_config(agent_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached config for an agent, or None if missing or expired
+    """
+    entry = _cache.get(agent_id)
+    if entry is None:
+        return None
+    expires_at, config, _ = entry
+    if expires_at < time.monotonic():
+        _cache.pop(agent_id, None)
+        return None
+    return config
+
+
+def get_cached_config_type_sets(agent_id: int, config: Dict[str, Any]) -> Optional[Dict[str, FrozenSet[str]]]:
+    """
+    Return the configured type sets cached with an agent's config, or None
+    unless that exact config is still cached
+    """
+    entry = _cache.get(agent_id)
+    if entry is None or entry[1] is not config or entry[0] < time.monotonic():
+        return None
+    return entry[2]
+
+
+def set_cached_billing_config(
+    agent_id: int, config: Dict[str, Any], type_sets: Optional[Dict[str, FrozenSet[str]]] = None
+) -> None:
+    """
+    Store an agent's config and its configured type sets, evicting the oldest entry when full
+    """
+    if agent_id not in _cache and len(_cache) >= BILLING_CONFIG_CACHE_SIZE:
+        _cache.pop(next(iter(_cache)), None)
+    _cache[agent_id] = (time.monotonic() + BILLING_CONFIG_TTL_SECONDS, config, type_sets or {})
+
+
+def get_cached_billing_plan(agent_id: int) -> Optional[Any]:
+    """
+    Return the cached billing plan for an agent, or None if missing or expired
+    """
+    entry = _plans.get(agent_id)
+    if entry is None:
+        return None
+    expires_at, plan = entry
+    if expires_at < time.monotonic():
+        _plans.pop(agent_id, None)
+        return None
+    return plan
+
+
+def set_cached_billing_plan(agent_id: int, plan: Any) -> None:
+    """
+    Store an agent's billing plan, evicting the oldest entry when full
+    """
+    if agent_id not in _plans and len(_plans) >= BILLING_CONFIG_CACHE_SIZE:
+        _plans.pop(next(iter(_plans)), None)
+    _plans[agent_id] = (time.monotonic() + BILLING_PLAN_TTL_SECONDS, plan)
+
+
+def invalidate_billing_config(agent_id: Optional[int] = None) -> None:
+    """
+    Drop the cached config and plan for one agent, or for all agents
+    """
+    if agent_id is None:
+        _cache.clear()
+        _plans.clear()
+    else:
+        _cache.pop(agent_id, None)
+        _plans.pop(agent_id, None)
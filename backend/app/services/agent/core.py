@@ -5,27 +5,56 @@ Core agent operations - CRUD operations for agents.
 from typing import List, Optional
 import logging
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.agent import Agent
+from app.models.billing_model import BillingModel
 from app.models.organization import Organization
 from app.schemas.agent import AgentCreate, AgentUpdate
+from .billing_cache import invalidate_billing_config
+from .stats_cache import invalidate_agent_stats
 
 logger = logging.getLogger(__name__)
 
 
-def get_agent(db: Session, agent_id: int) -> Optional[Agent]:
+# Configs needed for cost calculation: one-to-one configs are joined,
+# collections are selectin-loaded to avoid row explosion.
+_BILLING_CONFIG_OPTIONS = (
+    joinedload(BillingModel.agent_config),
+    joinedload(BillingModel.workflow_config),
+    selectinload(BillingModel.activity_config),
+    selectinload(BillingModel.outcome_config),
+    selectinload(BillingModel.workflow_types),
+    selectinload(BillingModel.commitment_tiers),
+)
+
+# AgentUpdate fields that map onto agent columns; the rest are accepted but ignored
+_AGENT_UPDATABLE_FIELDS = frozenset(AgentUpdate.model_fields) & frozenset(
+    column.name for column in Agent.__table__.columns
+)
+
+
+def get_agent(db: Session, agent_id: int, *, with_billing: bool = False) -> Optional[Agent]:
     """
-    Get agent by ID
+    Get agent by ID, optionally eager loading its billing model and configs
     """
-    return db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = db.get(Agent, agent_id)
+    if agent is not None and with_billing and agent.billing_model_id is not None:
+        # Load the billing model by key and attach it, so the configs are eager
+        # loaded even when the agent was already in the session without them
+        billing_model = db.get(BillingModel, agent.billing_model_id, options=_BILLING_CONFIG_OPTIONS)
+        set_committed_value(agent, "billing_model", billing_model)
+    return agent
 
 
 def get_agent_by_external_id(db: Session, external_id: str) -> Optional[Agent]:
     """
     Get agent by external ID
     """
-    return db.query(Agent).filter(Agent.external_id == external_id).first()
+    # lambda_stmt caches the built statement, so repeat calls only bind values
+    return db.scalars(lambda_stmt(lambda: select(Agent).where(Agent.external_id == external_id))).first()
 
 
 def get_agents_by_organization(
@@ -47,9 +76,7 @@ def create_agent(db: Session, agent_in: AgentCreate) -> Agent:
     Create a new agent for an organization
     """
     # Check if organization exists
-    organization = db.query(Organization).filter(
-        Organization.id == agent_in.organization_id
-    ).first()
+    organization = db.get(Organization, agent_in.organization_id)
     
     if not organization:
         raise ValueError(f"Organization with ID {agent_in.organization_id} not found")
@@ -75,11 +102,16 @@ def create_agent(db: Session, agent_in: AgentCreate) -> Agent:
     return agent
 
 
-def update_agent(db: Session, agent_id: int, agent_in: AgentUpdate) -> Optional[Agent]:
+def update_agent(
+    db: Session, agent_id: int, agent_in: AgentUpdate, *, agent: Optional[Agent] = None
+) -> Optional[Agent]:
     """
     Update an agent
+
+    Callers that already loaded the agent can pass it to skip the lookup.
     """
-    agent = get_agent(db, agent_id=agent_id)
+    if agent is None:
+        agent = db.get(Agent, agent_id)
     if not agent:
         logger.warning(f"Agent update failed: Agent not found with ID {agent_id}")
         return None
@@ -89,7 +121,7 @@ def update_agent(db: Session, agent_id: int, agent_in: AgentUpdate) -> Optional[
     
     # Update agent attributes
     for field, value in update_data.items():
-        if hasattr(agent, field):
+        if field in _AGENT_UPDATABLE_FIELDS:
             setattr(agent, field, value)
     
     # Update last active timestamp if the agent is active
@@ -98,28 +130,31 @@ def update_agent(db: Session, agent_id: int, agent_in: AgentUpdate) -> Optional[
     
     # Commit changes to database
     db.commit()
+    invalidate_billing_config(agent_id)
+    invalidate_agent_stats(agent_id)
     db.refresh(agent)
     
     logger.info(f"Updated agent: {agent.name}")
     return agent
 
 
-def delete_agent(db: Session, agent_id: int) -> Optional[Agent]:
+def delete_agent(db: Session, agent_id: int, *, agent: Optional[Agent] = None) -> Optional[Agent]:
     """
     Delete an agent
+
+    Callers that already loaded the agent can pass it to skip the lookup.
     """
-    agent = get_agent(db, agent_id=agent_id)
+    if agent is None:
+        agent = db.get(Agent, agent_id)
     if not agent:
         logger.warning(f"Agent deletion failed: Agent not found with ID {agent_id}")
         return None
 
-    # Manually delete related records to avoid FK constraint violations
-    from app.models.agent import AgentActivity, AgentCost, AgentOutcome
-    db.query(AgentActivity).filter(AgentActivity.agent_id == agent_id).delete(synchronize_session=False)
-    db.query(AgentCost).filter(AgentCost.agent_id == agent_id).delete(synchronize_session=False)
-    db.query(AgentOutcome).filter(AgentOutcome.agent_id == agent_id).delete(synchronize_session=False)
-    # Delete agent
+    # Activities, costs and outcomes go with it via ON DELETE CASCADE
+    # (passive_deletes on the relationships keeps the ORM from loading them)
     db.delete(agent)
     db.commit()
+    invalidate_billing_config(agent_id)
+    invalidate_agent_stats(agent_id)
     logger.info(f"Deleted agent and related records: {agent.name}")
     return agent
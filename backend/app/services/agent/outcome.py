@@ -4,12 +4,14 @@ Outcome operations for agents.
 
 import logging
 from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.models.agent import AgentOutcome as AgentOutcomeModel, AgentCost as AgentCostModel
+from app.models.agent import Agent, AgentOutcome as AgentOutcomeModel, AgentCost as AgentCostModel
 from app.schemas.agent import AgentOutcomeCreate
-from app.services.billing_model.calculation import calculate_cost
+from app.services.billing_model.calculation import get_cost_fn
 from .core import get_agent
+from .stats_cache import invalidate_agent_stats
 
 logger = logging.getLogger(__name__)
 
@@ -19,81 +21,69 @@ def record_agent_outcome(db: Session, outcome_in: AgentOutcomeCreate) -> AgentOu
     Record an outcome for an agent
     """
     # Check if agent exists
-    agent = get_agent(db, agent_id=outcome_in.agent_id)
+    agent = get_agent(db, agent_id=outcome_in.agent_id, with_billing=True)
     if not agent:
         raise ValueError(f"Agent with ID {outcome_in.agent_id} not found")
-    
-    # Create outcome
-    outcome = AgentOutcomeModel(
-        agent_id=outcome_in.agent_id,
+    return _record_outcome_with_cost(db, agent, outcome_in)
+
+
+def _record_outcome_with_cost(db: Session, agent: Agent, outcome_in: AgentOutcomeCreate) -> AgentOutcomeModel:
+    """
+    Insert an outcome and its auto-recorded cost for an agent loaded with its billing model
+    """
+    # One timestamp for the outcome and its cost entry
+    now = datetime.now(timezone.utc)
+
+    # Create outcome; RETURNING hands back the hydrated row in the same round-trip
+    outcome = db.scalars(insert(AgentOutcomeModel).returning(AgentOutcomeModel), [dict(
+        agent_id=agent.id,
         outcome_type=outcome_in.outcome_type,
         value=outcome_in.value,
         currency=outcome_in.currency,
-        timestamp=datetime.now(timezone.utc),
+        timestamp=now,
         details=outcome_in.details,
         verified=outcome_in.verified,
-    )
-    
-    # Add outcome to database
-    db.add(outcome)
-    db.commit()
-    db.refresh(outcome)
+    )]).one()
 
     logger.info(f"Recorded outcome {outcome.value} {outcome.currency} for agent: {agent.name}")
     # Auto-record cost for outcome based on billing model
     bm = agent.billing_model
     if bm and bm.model_type == "outcome":
-        # For outcome-based billing, use outcome_type from the config
-        if bm.model_type == "outcome":
-            # Find matching outcome config based on outcome_type
-            outcome_configs = bm.outcome_config or []
-            matching_config = None
-            for cfg in outcome_configs:
-                if cfg.outcome_type == outcome.outcome_type:
-                    matching_config = cfg
-                    break
+        # Find matching outcome config based on outcome_type
+        matching_config = bm.outcome_config_by_type.get(outcome.outcome_type)
+        
+        if matching_config:
+            # Use specific outcome config for calculation
+            usage_data = {"outcome_value": outcome.value, "outcome_type": outcome.outcome_type}
+            cost_amt = get_cost_fn(bm)(usage_data)
             
-            if matching_config:
-                # Use specific outcome config for calculation
-                usage_data = {"outcome_value": outcome.value, "outcome_type": outcome.outcome_type}
-                cost_amt = calculate_cost(bm, usage_data)
-                
-                # Create cost entry with enhanced details
-                cost_entry = AgentCostModel(
-                    agent_id=agent.id,
-                    cost_type="outcome",
-                    amount=cost_amt,
-                    currency=outcome.currency,
-                    timestamp=datetime.now(timezone.utc),
-                    details={
-                        "outcome_id": outcome.id, 
-                        "outcome_type": outcome.outcome_type,
-                        "outcome_name": matching_config.outcome_name,
-                        "base_platform_fee": matching_config.base_platform_fee,
-                        "percentage": matching_config.percentage,
-                        "attribution_window_days": matching_config.attribution_window_days,
-                        "requires_verification": matching_config.requires_verification,
-                        "verified": outcome.verified,
-                        "risk_premium_percentage": matching_config.risk_premium_percentage
-                    }
-                )
-                db.add(cost_entry)
-                db.commit()
-                logger.info(f"Auto-recorded outcome cost {cost_amt} {outcome.currency} for agent: {agent.name}")
-            else:
-                logger.warning(f"No matching outcome config found for outcome type: {outcome.outcome_type}")
-        else:
-            logger.warning(f"Unsupported model type for outcome tracking: {bm.model_type}")
-            
-            cost_entry = AgentCostModel(
+            # Create cost entry with enhanced details; the row is write-only,
+            # so a Core insert skips the ORM entirely
+            db.execute(insert(AgentCostModel.__table__), [dict(
                 agent_id=agent.id,
                 cost_type="outcome",
-                amount=0.0,
+                amount=cost_amt,
                 currency=outcome.currency,
-                timestamp=datetime.now(timezone.utc),
-                details={"outcome_id": outcome.id, "outcome_type": outcome.outcome_type}
-            )
-            db.add(cost_entry)
-            db.commit()
-            logger.info(f"Auto-recorded outcome cost 0.0 {outcome.currency} for agent: {agent.name}")
+                timestamp=now,
+                details={
+                    "outcome_id": outcome.id, 
+                    "outcome_type": outcome.outcome_type,
+                    "outcome_name": matching_config.outcome_name,
+                    "base_platform_fee": matching_config.base_platform_fee,
+                    "percentage": matching_config.percentage,
+                    "attribution_window_days": matching_config.attribution_window_days,
+                    "requires_verification": matching_config.requires_verification,
+                    "verified": outcome.verified,
+                    "risk_premium_percentage": matching_config.risk_premium_percentage
+                }
+            )])
+            logger.info(f"Auto-recorded outcome cost {cost_amt} {outcome.currency} for agent: {agent.name}")
+        else:
+            logger.warning(f"No matching outcome config found for outcome type: {outcome.outcome_type}")
+
+    # RETURNING already populated the row; detach it so commit doesn't expire it
+    # and force a refresh SELECT
+    db.expunge(outcome)
+    db.commit()
+    invalidate_agent_stats(outcome.agent_id)
     return outcome
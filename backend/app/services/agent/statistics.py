@@ -6,10 +6,11 @@ from typing import Dict, Any, Optional
 import logging
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 
-from app.models.agent import AgentActivity as AgentActivityModel, AgentCost as AgentCostModel, AgentOutcome as AgentOutcomeModel
+from app.models.agent import Agent, AgentCost as AgentCostModel
 from .core import get_agent
+from .stats_cache import get_cached_billing_summary, set_cached_billing_summary
 
 logger = logging.getLogger(__name__)
 
@@ -17,41 +18,41 @@ logger = logging.getLogger(__name__)
 def get_agent_stats(db: Session, agent_id: int) -> Dict[str, Any]:
     """
     Get statistics for an agent including activity count, costs, and outcomes
+
+    The figures are running totals kept on the agent row by database triggers,
+    so this is a single-row read regardless of history size.
     """
-    # Check if agent exists
-    agent = get_agent(db, agent_id=agent_id)
-    if not agent:
+    # Margin is evaluated in the same SELECT; the CASE guards the division
+    margin = case(
+        (
+            Agent.total_outcomes_value > 0,
+            (Agent.total_outcomes_value - Agent.total_cost) / Agent.total_outcomes_value,
+        ),
+        else_=0.0,
+    ).label("margin")
+    row = (
+        db.query(Agent.activity_count, Agent.total_cost, Agent.total_outcomes_value, margin)
+        .filter(Agent.id == agent_id)
+        .first()
+    )
+    if row is None:
         raise ValueError(f"Agent with ID {agent_id} not found")
     
-    # Count activities
-    activity_count = db.query(func.count(AgentActivityModel.id)).filter(
-        AgentActivityModel.agent_id == agent_id
-    ).scalar() or 0
-    
-    # Sum costs
-    total_cost = db.query(func.sum(AgentCostModel.amount)).filter(
-        AgentCostModel.agent_id == agent_id
-    ).scalar() or 0.0
-    
-    # Sum outcomes
-    total_outcomes_value = db.query(func.sum(AgentOutcomeModel.value)).filter(
-        AgentOutcomeModel.agent_id == agent_id
-    ).scalar() or 0.0
-    
-    # Calculate margin
-    margin = 0.0
-    if total_outcomes_value > 0:
-        margin = (total_outcomes_value - total_cost) / total_outcomes_value
-    
     return {
-        "activity_count": activity_count,
-        "total_cost": total_cost,
-        "total_outcomes_value": total_outcomes_value,
-        "margin": margin
+        "activity_count": row.activity_count or 0,
+        "total_cost": row.total_cost or 0.0,
+        "total_outcomes_value": row.total_outcomes_value or 0.0,
+        "margin": row.margin or 0.0
     }
 
 
-def get_agent_billing_summary(db: Session, agent_id: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, Any]:
+def get_agent_billing_summary(
+    db: Session,
+    agent_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    include_breakdown: bool = True,
+) -> Dict[str, Any]:
     """
     Get detailed billing summary for an agent including breakdown by cost type
     
@@ -59,26 +60,90 @@ def get_agent_billing_summary(db: Session, agent_id: int, start_date: Optional[d
         agent_id: ID of the agent
         start_date: Optional start date for filtering
         end_date: Optional end date for filtering
+        include_breakdown: Whether to list every cost row; when False only
+            the aggregates are computed and cost_breakdown is empty
     
     Returns:
-        Dictionary with detailed billing information
+        Dictionary with detailed billing information; summaries without a
+        breakdown are cached per agent until the agent's usage is next written,
+        so treat it as read-only
     """
+    cache_key = (start_date, end_date)
+    if not include_breakdown:
+        summary = get_cached_billing_summary(agent_id, cache_key)
+        if summary is not None:
+            return summary
+    
     # Check if agent exists
     agent = get_agent(db, agent_id=agent_id)
     if not agent:
         raise ValueError(f"Agent with ID {agent_id} not found")
     
-    # Base query for costs
-    cost_query = db.query(AgentCostModel).filter(AgentCostModel.agent_id == agent_id)
+    # Per cost type, the details key holding the subtype the summary breaks down by
+    subtype_keys = {"activity": "activity_type", "workflow": "workflow_type", "outcome": "outcome_type"}
+    subtype = case(
+        *[
+            (AgentCostModel.cost_type == cost_type, AgentCostModel.details[key].as_string())
+            for cost_type, key in subtype_keys.items()
+        ],
+        else_=None,
+    ).label("subtype")
+    # Workflow rows count their executions; other rows count once
+    unit_count = case(
+        (
+            AgentCostModel.cost_type == "workflow",
+            func.coalesce(AgentCostModel.details["workflow_count"].as_integer(), 1),
+        ),
+        else_=1,
+    )
     
-    # Apply date filters if provided
+    filters = [AgentCostModel.agent_id == agent_id]
     if start_date:
-        cost_query = cost_query.filter(AgentCostModel.timestamp >= start_date)
+        filters.append(AgentCostModel.timestamp >= start_date)
     if end_date:
-        cost_query = cost_query.filter(AgentCostModel.timestamp <= end_date)
+        filters.append(AgentCostModel.timestamp <= end_date)
+    
+    # Aggregate by cost type and subtype in the database; only the grouped rows
+    # come back instead of every cost row
+    grouped = (
+        db.query(
+            AgentCostModel.cost_type,
+            subtype,
+            func.sum(AgentCostModel.amount).label("total"),
+            func.count(AgentCostModel.id).label("count"),
+            func.sum(unit_count).label("units"),
+        )
+        .filter(*filters)
+        .group_by(AgentCostModel.cost_type, subtype)
+        .all()
+    )
     
-    # Get all costs
-    costs = cost_query.all()
+    # The breakdown needs the rows themselves, but only as plain column tuples
+    cost_breakdown = []
+    if include_breakdown:
+        breakdown_rows = (
+            db.query(
+                AgentCostModel.id,
+                AgentCostModel.cost_type,
+                AgentCostModel.amount,
+                AgentCostModel.currency,
+                AgentCostModel.timestamp,
+                AgentCostModel.details,
+            )
+            .filter(*filters)
+            .all()
+        )
+        cost_breakdown = [
+            {
+                "id": row.id,
+                "type": str(row.cost_type),
+                "amount": row.amount,
+                "currency": row.currency,
+                "timestamp": row.timestamp.isoformat(),
+                "details": row.details
+            }
+            for row in breakdown_rows
+        ]
     
     # Initialize summary
     summary = {
@@ -95,60 +160,30 @@ def get_agent_billing_summary(db: Session, agent_id: int, start_date: Optional[d
         },
         "total_cost": 0.0,
         "cost_by_type": {},
-        "cost_breakdown": [],
+        "cost_breakdown": cost_breakdown,
         "activity_stats": {},
         "workflow_stats": {},
         "outcome_stats": {}
     }
     
-    # Process costs
-    for cost in costs:
-        cost_type = str(cost.cost_type)
-        amount = cost.amount
-        details = cost.details
+    # Fold the grouped rows into totals and type-specific stats
+    for row in grouped:
+        cost_type = str(row.cost_type)
         
-        # Add to total
-        summary["total_cost"] += amount
+        summary["total_cost"] += row.total
         
-        # Add to cost by type
         if cost_type not in summary["cost_by_type"]:
             summary["cost_by_type"][cost_type] = {"total": 0.0, "count": 0}
-        summary["cost_by_type"][cost_type]["total"] += amount
-        summary["cost_by_type"][cost_type]["count"] += 1
-        
-        # Add to breakdown
-        summary["cost_breakdown"].append({
-            "id": cost.id,
-            "type": cost_type,
-            "amount": amount,
-            "currency": cost.currency,
-            "timestamp": cost.timestamp.isoformat(),
-            "details": details
-        })
-        
-        # Collect type-specific stats
-        if cost_type == "activity" and details is not None:
-            activity_type = details.get("activity_type")
-            if activity_type:
-                if activity_type not in summary["activity_stats"]:
-                    summary["activity_stats"][activity_type] = {"total_cost": 0.0, "count": 0}
-                summary["activity_stats"][activity_type]["total_cost"] += amount
-                summary["activity_stats"][activity_type]["count"] += 1
-        
-        elif cost_type == "workflow" and details is not None:
-            workflow_type = details.get("workflow_type")
-            if workflow_type:
-                if workflow_type not in summary["workflow_stats"]:
-                    summary["workflow_stats"][workflow_type] = {"total_cost": 0.0, "count": 0}
-                summary["workflow_stats"][workflow_type]["total_cost"] += amount
-                summary["workflow_stats"][workflow_type]["count"] += details.get("workflow_count", 1)
+        summary["cost_by_type"][cost_type]["total"] += row.total
+        summary["cost_by_type"][cost_type]["count"] += row.count
         
-        elif cost_type == "outcome" and details is not None:
-            outcome_type = details.get("outcome_type")
-            if outcome_type:
-                if outcome_type not in summary["outcome_stats"]:
-                    summary["outcome_stats"][outcome_type] = {"total_cost": 0.0, "count": 0}
-                summary["outcome_stats"][outcome_type]["total_cost"] += amount
-                summary["outcome_stats"][outcome_type]["count"] += 1
+        if row.subtype:
+            stats = summary[f"{cost_type}_stats"]
+            if row.subtype not in stats:
+                stats[row.subtype] = {"total_cost": 0.0, "count": 0}
+            stats[row.subtype]["total_cost"] += row.total
+            stats[row.subtype]["count"] += row.units
     
+    if not include_breakdown:
+        set_cached_billing_summary(agent_id, cache_key, summary)
     return summary
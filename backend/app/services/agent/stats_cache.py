@@ -0,0 +1,63 @@
+"""
+In-process cache for assembled agent billing summaries.
+
+Billing summaries aggregate every cost row in a period and are polled by
+dashboards far more often than the agent records new usage. Aggregate
+summaries (without the per-row cost breakdown) are kept for a short TTL per
+agent and dropped whenever that agent's activity,
+costs, outcomes or workflows are written; the TTL bounds staleness across
+worker processes.
+"""
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+STATS_CACHE_TTL_SECONDS = 30.0
+STATS_CACHE_SIZE = 10_000
+STATS_CACHE_ENTRIES_PER_AGENT = 16
+
+# agent_id -> {summary key: (expires_at, summary)}
+_cache: Dict[int, Dict[Hashable, Tuple[float, Dict[str, Any]]]] = {}
+
+
+def get_cached_billing_summary(agent_id: int, key: Hashable) -> Optional[Dict[str, Any]]:
+    """
+    Return a cached summary for an agent and query key, or None if missing or expired
+    """
+    entry = _cache.get(agent_id, {}).get(key)
+    if entry is None:
+        return None
+    expires_at, summary = entry
+    if expires_at < time.monotonic():
+        _cache[agent_id].pop(key, None)
+        return None
+    return summary
+
+
+def set_cached_billing_summary(agent_id: int, key: Hashable, summary: Dict[str, Any]) -> None:
+    """
+    Store a summary, evicting the oldest agent's entries when full
+
+    Each agent keeps at most STATS_CACHE_ENTRIES_PER_AGENT summaries; expired
+    ones are dropped first, then the oldest.
+    """
+    if agent_id not in _cache and len(_cache) >= STATS_CACHE_SIZE:
+        _cache.pop(next(iter(_cache)), None)
+    entries = _cache.setdefault(agent_id, {})
+    now = time.monotonic()
+    if key not in entries and len(entries) >= STATS_CACHE_ENTRIES_PER_AGENT:
+        for expired_key in [k for k, (expires_at, _) in entries.items() if expires_at < now]:
+            del entries[expired_key]
+        if len(entries) >= STATS_CACHE_ENTRIES_PER_AGENT:
+            entries.pop(next(iter(entries)), None)
+    entries[key] = (now + STATS_CACHE_TTL_SECONDS, summary)
+
+
+def invalidate_agent_stats(agent_id: Optional[int] = None) -> None:
+    """
+    Drop the cached summaries for one agent, or for all agents
+    """
+    if agent_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(agent_id, None)
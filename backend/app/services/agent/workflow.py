@@ -5,11 +5,13 @@ Workflow operations for agents.
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.agent import AgentCost as AgentCostModel
-from app.services.billing_model.calculation import calculate_cost
+from app.services.billing_model.calculation import get_cost_fn
 from .core import get_agent
+from .stats_cache import invalidate_agent_stats
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ def record_agent_workflow(db: Session, agent_id: int, workflow_type: str, workfl
     Record a workflow execution for an agent and auto-calculate cost
     """
     # Check if agent exists
-    agent = get_agent(db, agent_id=agent_id)
+    agent = get_agent(db, agent_id=agent_id, with_billing=True)
     if not agent:
         raise ValueError(f"Agent with ID {agent_id} not found")
     
@@ -29,22 +31,17 @@ def record_agent_workflow(db: Session, agent_id: int, workflow_type: str, workfl
         raise ValueError(f"Agent {agent_id} does not have a workflow billing model")
     
     # Find matching workflow type config
-    workflow_configs = bm.workflow_types or []
-    matching_config = None
-    for cfg in workflow_configs:
-        if cfg.workflow_type == workflow_type:
-            matching_config = cfg
-            break
+    matching_config = bm.workflow_types_by_type.get(workflow_type)
     
     if not matching_config:
         raise ValueError(f"No workflow configuration found for type: {workflow_type}")
     
     # Calculate cost based on workflow config
     usage_data = {"workflows": {workflow_type: 1}}
-    cost_amt = calculate_cost(bm, usage_data)
+    cost_amt = get_cost_fn(bm)(usage_data)
     
     # Create cost entry for workflow
-    cost_entry = AgentCostModel(
+    cost_entry = db.scalars(insert(AgentCostModel).returning(AgentCostModel), [dict(
         agent_id=agent_id,
         cost_type="workflow",
         amount=cost_amt,
@@ -58,11 +55,12 @@ def record_agent_workflow(db: Session, agent_id: int, workflow_type: str, workfl
             "business_value_category": matching_config.business_value_category,
             "metadata": workflow_metadata or {}
         }
-    )
+    )]).one()
     
-    db.add(cost_entry)
+    # RETURNING already populated the row; detach it so commit doesn't expire it
+    db.expunge(cost_entry)
     db.commit()
-    db.refresh(cost_entry)
+    invalidate_agent_stats(agent_id)
     
     logger.info(f"Recorded workflow execution {workflow_type} cost {cost_amt} for agent: {agent.name}")
     return cost_entry
@@ -81,7 +79,7 @@ def record_bulk_workflows(db: Session, agent_id: int, workflow_executions: Dict[
         List of created cost entries
     """
     # Check if agent exists
-    agent = get_agent(db, agent_id=agent_id)
+    agent = get_agent(db, agent_id=agent_id, with_billing=True)
     if not agent:
         raise ValueError(f"Agent with ID {agent_id} not found")
     
@@ -90,41 +88,43 @@ def record_bulk_workflows(db: Session, agent_id: int, workflow_executions: Dict[
     if not bm or bm.model_type != "workflow":
         raise ValueError(f"Agent {agent_id} does not have a workflow billing model")
     
+    # Only positive counts are billed; drop the rest before pricing
+    workflow_executions = {wf: count for wf, count in workflow_executions.items() if count > 0}
+    total_workflows = sum(workflow_executions.values())
+    if total_workflows == 0:
+        return []
+    
     # Calculate cost for all workflows
     usage_data = {
         "workflows": workflow_executions,
         "commitment_exceeded": commitment_exceeded
     }
-    total_cost = calculate_cost(bm, usage_data)
+    total_cost = get_cost_fn(bm)(usage_data)
     
-    # Create individual cost entries for each workflow type
-    cost_entries = []
-    total_workflows = sum(workflow_executions.values())
+    # Build one cost row per workflow type and insert them in a single statement
+    cost_rows = []
+    wt_by_type = bm.workflow_types_by_type
+    currency = bm.workflow_config.currency if bm.workflow_config else "USD"
+    # One timestamp for the whole batch
+    now = datetime.now(timezone.utc)
     
     for workflow_type, count in workflow_executions.items():
-        if count <= 0:
-            continue
-            
         # Find matching workflow config
-        matching_config = None
-        for cfg in bm.workflow_types:
-            if cfg.workflow_type == workflow_type:
-                matching_config = cfg
-                break
+        matching_config = wt_by_type.get(workflow_type)
         
         if not matching_config:
             logger.warning(f"No workflow configuration found for type: {workflow_type}")
             continue
         
         # Calculate proportional cost for this workflow type
-        proportional_cost = (count / total_workflows) * total_cost if total_workflows > 0 else 0
+        proportional_cost = (count / total_workflows) * total_cost
         
-        cost_entry = AgentCostModel(
+        cost_rows.append(dict(
             agent_id=agent_id,
             cost_type="workflow",
             amount=proportional_cost,
-            currency=bm.workflow_config.currency if bm.workflow_config else "USD",
-            timestamp=datetime.now(timezone.utc),
+            currency=currency,
+            timestamp=now,
             details={
                 "workflow_type": workflow_type,
                 "workflow_name": matching_config.workflow_name,
@@ -135,12 +135,20 @@ def record_bulk_workflows(db: Session, agent_id: int, workflow_executions: Dict[
                 "business_value_category": matching_config.business_value_category,
                 "batch_total_cost": total_cost
             }
-        )
-        
-        cost_entries.append(cost_entry)
-        db.add(cost_entry)
+        ))
+    
+    cost_entries = []
+    if cost_rows:
+        cost_entries = db.scalars(
+            insert(AgentCostModel).returning(AgentCostModel, sort_by_parameter_order=True),
+            cost_rows,
+        ).all()
+        # RETURNING already populated the rows; detach them so commit doesn't expire them
+        for cost_entry in cost_entries:
+            db.expunge(cost_entry)
     
     db.commit()
+    invalidate_agent_stats(agent_id)
     logger.info(f"Recorded {len(cost_entries)} workflow cost entries totaling {total_cost} for agent: {agent.name}")
     
     return cost_entries
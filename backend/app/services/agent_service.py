@@ -17,6 +17,7 @@ from app.services.agent import (
     
     # Activity operations
     record_agent_activity,
+    record_agent_activities,
     
     # Cost operations
     record_agent_cost,
@@ -50,6 +51,7 @@ __all__ = [
     
     # Activity operations
     "record_agent_activity",
+    "record_agent_activities",
     
     # Cost operations
     "record_agent_cost",
@@ -1,26 +1,45 @@
+import base64
 import secrets
 import hashlib
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import and_, inspect, lambda_stmt, select, update
 
 from app.models.api_key import ApiKey
 from app.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
 
+# Authenticated keys by hash, as detached copies of their columns. Keys are
+# written far less often than they are used; writes here drop the entry, and
+# a cache hit still re-reads is_active and expires_at by primary key, so a key
+# revoked by another worker process is rejected on its next use.
+AUTH_CACHE_TTL_SECONDS = 60.0
+AUTH_CACHE_SIZE = 4096
 
-def generate_api_key() -> tuple[str, str, str]:
+# last_used is informational, so it is written at most once per interval per key
+LAST_USED_WRITE_INTERVAL_SECONDS = 60.0
+
+# 24 random bytes encode to exactly 32 urlsafe base64 chars, with no padding
+_KEY_PREFIX = b"xyra_"
+_KEY_RANDOM_BYTES = 24
+
+_auth_cache: Dict[bytes, Tuple[float, ApiKey]] = {}
+_last_used_written: Dict[int, float] = {}
+
+
+def generate_api_key() -> tuple[str, bytes, str]:
     """
     Generate a new API key with format: xyra_<32-char-random>
     Returns: (full_key, key_hash, key_prefix)
     """
-    # Generate random key
-    random_part = secrets.token_urlsafe(24)  # 32 chars after encoding
-    full_key = f"xyra_{random_part}"
+    # Generate random key, staying in bytes until the hash is taken
+    key_bytes = _KEY_PREFIX + base64.urlsafe_b64encode(secrets.token_bytes(_KEY_RANDOM_BYTES))
+    full_key = key_bytes.decode("ascii")
     
-    # Create hash for storage
-    key_hash = hashlib.sha256(full_key.encode()).hexdigest()
+    # Create hash for storage (raw digest, half the size of hex in the index)
+    key_hash = hashlib.sha256(key_bytes).digest()
     
     # Create prefix for display (first 12 chars + ...)
     key_prefix = full_key[:12] + "..."
@@ -66,44 +85,109 @@ def get_api_keys_by_organization(db: Session, organization_id: int, skip: int =
 
 def get_api_key(db: Session, api_key_id: int, user_id: int, organization_id: int) -> Optional[ApiKey]:
     """Get a specific API key by ID (user must own it and it must be in their org)"""
-    return db.query(ApiKey).filter(
-        and_(
-            ApiKey.id == api_key_id, 
-            ApiKey.user_id == user_id,
-            ApiKey.organization_id == organization_id
-        )
-    ).first()
+    # lambda_stmt caches the built statement, so repeat calls only bind values
+    stmt = lambda_stmt(lambda: select(ApiKey).where(
+        ApiKey.id == api_key_id,
+        ApiKey.user_id == user_id,
+        ApiKey.organization_id == organization_id,
+    ))
+    return db.scalars(stmt).first()
 
 
-def get_api_key_by_hash(db: Session, key_hash: str) -> Optional[ApiKey]:
+def get_api_key_by_hash(db: Session, key_hash: bytes) -> Optional[ApiKey]:
     """Get API key by hash (for authentication)"""
-    return db.query(ApiKey).filter(
-        and_(ApiKey.key_hash == key_hash, ApiKey.is_active == True)
-    ).first()
+    stmt = lambda_stmt(lambda: select(ApiKey).where(ApiKey.key_hash == key_hash, ApiKey.is_active == True))
+    return db.scalars(stmt).first()
+
+
+def _get_api_key_revocation(db: Session, api_key_id: int):
+    """Get just the is_active and expires_at columns of a key by ID"""
+    stmt = lambda_stmt(lambda: select(ApiKey.is_active, ApiKey.expires_at).where(ApiKey.id == api_key_id))
+    return db.execute(stmt).first()
+
+
+def _get_cached_api_key(key_hash: bytes) -> Optional[ApiKey]:
+    """Return the cached key for a hash, or None if missing or expired"""
+    entry = _auth_cache.get(key_hash)
+    if entry is None:
+        return None
+    expires_at, api_key = entry
+    if expires_at < time.monotonic():
+        _auth_cache.pop(key_hash, None)
+        return None
+    return api_key
+
+
+def _set_cached_api_key(key_hash: bytes, api_key: ApiKey) -> None:
+    """Store an authenticated key, evicting the oldest entry when full"""
+    if key_hash not in _auth_cache and len(_auth_cache) >= AUTH_CACHE_SIZE:
+        _auth_cache.pop(next(iter(_auth_cache)), None)
+    _auth_cache[key_hash] = (time.monotonic() + AUTH_CACHE_TTL_SECONDS, api_key)
+
+
+def _detached_copy(api_key: ApiKey) -> ApiKey:
+    """Copy a key's column values into a detached instance safe to share"""
+    detached = ApiKey(**{attr.key: getattr(api_key, attr.key) for attr in inspect(ApiKey).column_attrs})
+    make_transient_to_detached(detached)
+    return detached
+
+
+def invalidate_api_key_cache(key_hash: Optional[bytes] = None) -> None:
+    """Drop one cached key by hash, or all of them"""
+    if key_hash is None:
+        _auth_cache.clear()
+    else:
+        _auth_cache.pop(key_hash, None)
 
 
 def authenticate_api_key(db: Session, api_key: str) -> Optional[ApiKey]:
-    """Authenticate an API key and return the associated key object"""
+    """
+    Authenticate an API key and return the associated key object
+
+    Active keys are cached by hash for a short TTL, so repeat requests with
+    the same key skip the hash lookup and merge the cached copy into the
+    session; only the revocation columns are read back from the database.
+    """
     if not api_key.startswith("xyra_"):
         return None
     
     # Hash the provided key
-    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    
-    # Find the key in database
-    api_key_obj = get_api_key_by_hash(db, key_hash)
+    key_hash = hashlib.sha256(api_key.encode()).digest()
     
-    if api_key_obj:
-        # Check if key is expired (use getattr to get actual value)
-        expires_at = getattr(api_key_obj, 'expires_at')
-        if expires_at is not None and expires_at < datetime.now(timezone.utc):
+    # Find the key in the cache, then the database
+    cached = _get_cached_api_key(key_hash)
+    if cached is None:
+        api_key_obj = get_api_key_by_hash(db, key_hash)
+        if api_key_obj is None:
             return None
-        
-        # Update last used timestamp
-        setattr(api_key_obj, 'last_used', datetime.now(timezone.utc))
+        cached = _detached_copy(api_key_obj)
+        _set_cached_api_key(key_hash, cached)
+        expires_at = cached.expires_at
+    else:
+        # The key may have been revoked or changed by another worker process
+        revocation = _get_api_key_revocation(db, cached.id)
+        if revocation is None or not revocation.is_active:
+            invalidate_api_key_cache(key_hash)
+            return None
+        expires_at = revocation.expires_at
+    
+    # Check if key is expired
+    now = datetime.now(timezone.utc)
+    if expires_at is not None and expires_at < now:
+        return None
+    
+    # Update last used timestamp by key, without loading the row, unless it
+    # was written recently by this process
+    now_ts = time.monotonic()
+    if now_ts - _last_used_written.get(cached.id, float("-inf")) >= LAST_USED_WRITE_INTERVAL_SECONDS:
+        db.execute(update(ApiKey).where(ApiKey.id == cached.id).values(last_used=now))
         db.commit()
-        
-    return api_key_obj
+        if cached.id not in _last_used_written and len(_last_used_written) >= AUTH_CACHE_SIZE:
+            _last_used_written.pop(next(iter(_last_used_written)), None)
+        _last_used_written[cached.id] = now_ts
+    
+    # Merged after any commit so the returned key is not expired
+    return db.merge(cached, load=False)
 
 
 def update_api_key(db: Session, api_key_id: int, user_id: int, organization_id: int, api_key_update: ApiKeyUpdate) -> Optional[ApiKey]:
@@ -117,6 +201,7 @@ def update_api_key(db: Session, api_key_id: int, user_id: int, organization_id:
         setattr(api_key, field, value)
     
     db.commit()
+    invalidate_api_key_cache(api_key.key_hash)
     db.refresh(api_key)
     return api_key
 
@@ -127,8 +212,10 @@ def delete_api_key(db: Session, api_key_id: int, user_id: int, organization_id:
     if not api_key:
         return False
     
+    key_hash = api_key.key_hash
     db.delete(api_key)
     db.commit()
+    invalidate_api_key_cache(key_hash)
     return True
 
 
@@ -140,5 +227,6 @@ def deactivate_api_key(db: Session, api_key_id: int, user_id: int, organization_
     
     setattr(api_key, 'is_active', False)
     db.commit()
+    invalidate_api_key_cache(api_key.key_hash)
     db.refresh(api_key)
     return api_key
@@ -1,243 +1,394 @@
-from typing import Dict, Any
+from bisect import bisect_left
+from functools import partial
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, Hashable, Iterable, List, Tuple
+from sqlalchemy import inspect
 from app.models.billing_model import BillingModel
 
+COST_FN_CACHE_SIZE = 4096
+
+# Cost functions keyed by (billing_model.id, billing_model.updated_at); every
+# billing model write bumps updated_at, so stale entries are never hit again
+_cost_fns: Dict[Hashable, Callable[[Dict[str, Any]], float]] = {}
+
+
+def freeze_row(row):
+    """Copy a config row's column values into a plain namespace"""
+    return SimpleNamespace(**{attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs})
+
+
+def _tier_ladder(tiers: Tuple[Tuple[float, float], ...], final_rate: float) -> SimpleNamespace:
+    """
+    Precompute where each (width, rate) tier starts and ends and the cost of the tiers below it
+
+    Tiers with no width are dropped. Quantities past the last tier are charged at final_rate.
+    """
+    starts, prefix_costs, rates = [0], [0.0], []
+    for width, rate in tiers:
+        if width > 0:
+            starts.append(starts[-1] + width)
+            prefix_costs.append(prefix_costs[-1] + width * rate)
+            rates.append(rate)
+    rates.append(final_rate)
+    return SimpleNamespace(
+        starts=tuple(starts), ends=tuple(starts[1:]), prefix_costs=tuple(prefix_costs), rates=tuple(rates)
+    )
+
+
+def _tiered_cost(quantity: float, ladder: SimpleNamespace) -> float:
+    """
+    Charge a quantity up a tier ladder, finding its tier by binary search
+    """
+    if quantity <= 0:
+        return 0.0
+    i = bisect_left(ladder.ends, quantity)
+    return ladder.prefix_costs[i] + (quantity - ladder.starts[i]) * ladder.rates[i]
+
+
+def _volume_tiers(cfg) -> Tuple[Tuple[float, float], ...]:
+    """
+    (width, price) of each configured volume tier of an activity config or workflow type
+    """
+    tiers = []
+    if cfg.volume_tier_1_threshold and cfg.volume_tier_1_price is not None:
+        tiers.append((cfg.volume_tier_1_threshold, cfg.volume_tier_1_price))
+    if cfg.volume_tier_2_threshold and cfg.volume_tier_2_price is not None and cfg.volume_tier_1_threshold:
+        tiers.append((cfg.volume_tier_2_threshold - cfg.volume_tier_1_threshold, cfg.volume_tier_2_price))
+    if cfg.volume_tier_3_threshold and cfg.volume_tier_3_price is not None and cfg.volume_tier_2_threshold:
+        tiers.append((cfg.volume_tier_3_threshold - cfg.volume_tier_2_threshold, cfg.volume_tier_3_price))
+    return tuple(tiers)
+
+
+def _outcome_tiers(cfg) -> Tuple[Tuple[float, float], ...]:
+    """
+    (width, rate) of each configured percentage tier of an outcome config; a tier only applies after the one before it
+    """
+    tiers = [(cfg.tier_1_threshold, cfg.tier_1_percentage / 100.0)]
+    if cfg.tier_2_threshold and cfg.tier_2_percentage:
+        tiers.append((cfg.tier_2_threshold - cfg.tier_1_threshold, cfg.tier_2_percentage / 100.0))
+        if cfg.tier_3_threshold and cfg.tier_3_percentage:
+            tiers.append((cfg.tier_3_threshold - cfg.tier_2_threshold, cfg.tier_3_percentage / 100.0))
+    return tuple(tiers)
+
+
+def _compile_activity_config(cfg) -> SimpleNamespace:
+    """Freeze an activity config with its volume tier ladder"""
+    row = freeze_row(cfg)
+    # Units past the last tier use its price or the base price
+    final_price = cfg.volume_tier_3_price if cfg.volume_tier_3_price is not None else cfg.price_per_unit
+    row.volume_ladder = _tier_ladder(_volume_tiers(cfg), final_price)
+    return row
+
+
+def _compile_outcome_config(cfg) -> SimpleNamespace:
+    """Freeze an outcome config with its percentage tier ladder, if tiered"""
+    row = freeze_row(cfg)
+    row.percentage_ladder = None
+    if cfg.tier_1_threshold and cfg.tier_1_percentage:
+        # Value past the last tier uses its percentage or the base percentage; the
+        # ladder is only used when percentage is positive, so the 0.0 is never charged
+        final_rate = (cfg.tier_3_percentage or cfg.percentage or 0.0) / 100.0
+        row.percentage_ladder = _tier_ladder(_outcome_tiers(cfg), final_rate)
+    return row
+
+
+def _compile_workflow_type(workflow_type) -> SimpleNamespace:
+    """Freeze a workflow type with its volume tier ladder, if tiered"""
+    row = freeze_row(workflow_type)
+    row.volume_ladder = None
+    if workflow_type.volume_tier_1_threshold and workflow_type.volume_tier_1_price is not None:
+        # Workflows past the last tier use its price or the base price
+        final_price = (workflow_type.volume_tier_3_price if workflow_type.volume_tier_3_price is not None
+                       else workflow_type.price_per_workflow)
+        row.volume_ladder = _tier_ladder(_volume_tiers(workflow_type), final_price)
+    return row
+
+
+def _compile_plan(billing_model: BillingModel) -> SimpleNamespace:
+    """
+    Snapshot a billing model's active configs, resolving tiers and fallback rates once
+
+    Only the configs its model type's calculator reads are loaded; the others stay empty.
+    """
+    model_type = str(billing_model.model_type)
+    plan = SimpleNamespace(
+        id=billing_model.id,
+        model_type=model_type,
+        agent_config=None,
+        activity_config=(),
+        outcome_config=(),
+        workflow_config=None,
+        workflow_types=(),
+    )
+    if model_type == "agent":
+        plan.agent_config = freeze_row(billing_model.agent_config) if billing_model.agent_config else None
+    elif model_type == "activity":
+        plan.activity_config = tuple(
+            _compile_activity_config(cfg) for cfg in billing_model.activity_config if cfg.is_active
+        )
+    elif model_type == "outcome":
+        plan.outcome_config = tuple(
+            _compile_outcome_config(cfg) for cfg in billing_model.outcome_config if cfg.is_active
+        )
+    elif model_type == "workflow":
+        plan.workflow_config = freeze_row(billing_model.workflow_config) if billing_model.workflow_config else None
+        plan.workflow_types = tuple(
+            _compile_workflow_type(wt) for wt in billing_model.workflow_types if wt.is_active
+        )
+    return plan
+
+
+def compile_cost_fn(billing_model: BillingModel) -> Callable[[Dict[str, Any]], float]:
+    """
+    Compile a billing model's configs once and bind its type's calculator to them
+    """
+    plan = _compile_plan(billing_model)
+    return partial(_COST_CALCULATORS.get(plan.model_type, _calculate_no_cost), plan)
+
+
+def get_cost_fn(billing_model: BillingModel) -> Callable[[Dict[str, Any]], float]:
+    """
+    Get the cached cost function for a billing model, compiling it on first use
+    """
+    key = (billing_model.id, billing_model.updated_at)
+    cost_fn = _cost_fns.get(key)
+    if cost_fn is None:
+        if len(_cost_fns) >= COST_FN_CACHE_SIZE:
+            _cost_fns.pop(next(iter(_cost_fns)), None)
+        cost_fn = _cost_fns[key] = compile_cost_fn(billing_model)
+    return cost_fn
+
+
+def _calculate_agent_cost(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Per-agent fee with optional setup fee and volume discount
+    """
+    total_cost = 0.0
+    # Expect one AgentBasedConfig row
+    if plan.agent_config:
+        cfg = plan.agent_config
+        agents = usage_data.get("agents", 1)  # Default to 1 agent
+
+        # Calculate base cost
+        base_cost = cfg.base_agent_fee * agents
+
+        # Add setup fee (one-time, so only if usage_data indicates this is initial billing)
+        if usage_data.get("include_setup_fee", False):
+            base_cost += cfg.setup_fee
+
+        # Apply volume discount if enabled and threshold met
+        if cfg.volume_discount_enabled and agents >= (cfg.volume_discount_threshold or 0):
+            discount = base_cost * (cfg.volume_discount_percentage or 0) / 100.0
+            base_cost -= discount
+
+        total_cost = base_cost
+    return total_cost
+
+
+def _calculate_activity_cost(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Per-unit pricing with optional volume tiers, base agent fees and minimum charges
+    """
+    total_cost = 0.0
+    # Enhanced activity-based billing with volume pricing and base agent fees
+    units_used = usage_data.get("units", 0)  # Generic units (actions, tokens, etc.)
+    agents = usage_data.get("agents", 1)  # Number of agents for base fee calculation
+
+    for cfg in plan.activity_config:
+        activity_cost = 0.0
+
+        # Add base agent fee if configured
+        if cfg.base_agent_fee > 0:
+            activity_cost += cfg.base_agent_fee * agents
+
+        # Calculate unit-based cost with volume pricing
+        if cfg.volume_pricing_enabled and units_used > 0:
+            # Apply tiered pricing
+            activity_cost += _tiered_cost(units_used, cfg.volume_ladder)
+        else:
+            # Simple unit-based pricing
+            activity_cost += cfg.price_per_unit * units_used
+
+        # Apply minimum charge if configured
+        if cfg.minimum_charge > 0:
+            activity_cost = max(activity_cost, cfg.minimum_charge)
+
+        total_cost += activity_cost
+    return total_cost
+
+
+def _calculate_outcome_cost(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Platform fee plus percentage and fixed fees on the outcome value
+    """
+    total_cost = 0.0
+    # Enhanced outcome-based billing with sophisticated pricing
+    outcome_value = usage_data.get("outcome_value", 0)
+
+    # Without a value only the base platform fees (operational costs) apply
+    if outcome_value <= 0:
+        return sum((cfg.base_platform_fee for cfg in plan.outcome_config), 0.0)
+
+    for cfg in plan.outcome_config:
+        # Below the minimum attribution value, only the platform fee applies
+        if cfg.minimum_attribution_value and outcome_value < cfg.minimum_attribution_value:
+            total_cost += cfg.base_platform_fee
+            continue
+
+        # Add base platform fee (covers operational costs)
+        config_cost = cfg.base_platform_fee
+
+        # Calculate outcome-based fee using tiered pricing if configured
+        outcome_fee = 0.0
+        percentage_based_fee = 0.0
+        fixed_fee = 0.0
+
+        # 1. Calculate percentage-based fee
+        if cfg.percentage is not None and cfg.percentage > 0:
+            # Apply tiered pricing if configured
+            if cfg.percentage_ladder is not None:
+                percentage_based_fee = _tiered_cost(outcome_value, cfg.percentage_ladder)
+            else:
+                # Simple percentage-based pricing
+                percentage_based_fee = outcome_value * (cfg.percentage / 100.0)
+
+        # 2. Calculate fixed charge fee
+        if cfg.fixed_charge_per_outcome is not None and cfg.fixed_charge_per_outcome > 0:
+            outcome_count = usage_data.get("outcome_count", 1) # Default to 1 if value > 0
+            fixed_fee = cfg.fixed_charge_per_outcome * outcome_count
+
+        outcome_fee = percentage_based_fee + fixed_fee
+
+        # Apply risk premium if configured
+        if cfg.risk_premium_percentage > 0:
+            risk_adjustment = outcome_fee * (cfg.risk_premium_percentage / 100.0)
+            outcome_fee += risk_adjustment
+
+        # Apply success bonus if threshold is met
+        if cfg.success_bonus_threshold and cfg.success_bonus_percentage and outcome_value >= cfg.success_bonus_threshold:
+            bonus = outcome_value * (cfg.success_bonus_percentage / 100.0)
+            outcome_fee += bonus
+
+        # Apply monthly cap if configured (should apply to total config cost)
+        if cfg.monthly_cap_amount and config_cost + outcome_fee > cfg.monthly_cap_amount:
+            config_cost = cfg.monthly_cap_amount
+        else:
+            config_cost += outcome_fee
+
+        total_cost += config_cost
+    return total_cost
+
+
+def _calculate_workflow_cost(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Platform fee plus per-workflow pricing
+    """
+    total_cost, _ = _workflow_cost_breakdown(plan, usage_data)
+    return total_cost
+
+
+def _calculate_no_cost(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Billing model types without a calculator cost nothing
+    """
+    return 0.0
+
+
+# Cost calculator per billing model type
+_COST_CALCULATORS: Dict[str, Callable[[SimpleNamespace, Dict[str, Any]], float]] = {
+    "agent": _calculate_agent_cost,
+    "activity": _calculate_activity_cost,
+    "outcome": _calculate_outcome_cost,
+    "workflow": _calculate_workflow_cost,
+}
+
+
+def _price_plan(plan: SimpleNamespace, usage_data: Dict[str, Any]) -> float:
+    """
+    Price usage against a compiled plan
+    """
+    return _COST_CALCULATORS.get(plan.model_type, _calculate_no_cost)(plan, usage_data)
+
+
 def calculate_cost(billing_model: BillingModel, usage_data: Dict[str, Any]) -> float:
     """
     Calculate cost based on billing model and usage data using dedicated config tables
+
+    Compiles the model's configs on every call; repeat callers should use get_cost_fn.
+    """
+    return _price_plan(_compile_plan(billing_model), usage_data)
+
+
+def calculate_cost_batch(billing_model: BillingModel, usage_rows: Iterable[Dict[str, Any]]) -> List[float]:
+    """
+    Calculate the cost of many usage records against one billing model
+
+    The model's configs are compiled once for the whole batch.
+    """
+    cost_fn = compile_cost_fn(billing_model)
+    return [cost_fn(usage_data) for usage_data in usage_rows]
+
+
+def calculate_workflow_cost_breakdown(
+    billing_model: BillingModel, usage_data: Dict[str, Any]
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Calculate workflow-based cost along with the cost of each workflow type
+
+    Per-type costs exclude the platform fee and global volume discount, which
+    only apply to the total.
+    """
+    return _workflow_cost_breakdown(_compile_plan(billing_model), usage_data)
+
+
+def _workflow_cost_breakdown(
+    plan: SimpleNamespace, usage_data: Dict[str, Any]
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Workflow cost and per-type costs against a compiled plan
     """
-    # Use dedicated config tables via relationships
     total_cost = 0.0
-    current_model_type = str(billing_model.model_type)
-    
-    if current_model_type == "agent":
-        # Expect one AgentBasedConfig row
-        if billing_model.agent_config:
-            cfg = billing_model.agent_config
-            agents = usage_data.get("agents", 1)  # Default to 1 agent
-            
-            # Calculate base cost
-            base_cost = cfg.base_agent_fee * agents
-            
-            # Add setup fee (one-time, so only if usage_data indicates this is initial billing)
-            if usage_data.get("include_setup_fee", False):
-                base_cost += cfg.setup_fee
-            
-            # Apply volume discount if enabled and threshold met
-            if cfg.volume_discount_enabled and agents >= (cfg.volume_discount_threshold or 0):
-                discount = base_cost * (cfg.volume_discount_percentage or 0) / 100.0
-                base_cost -= discount
-            
-            total_cost = base_cost
-    elif current_model_type == "activity":
-        # Enhanced activity-based billing with volume pricing and base agent fees
-        units_used = usage_data.get("units", 0)  # Generic units (actions, tokens, etc.)
-        agents = usage_data.get("agents", 1)  # Number of agents for base fee calculation
+    workflow_costs: Dict[str, float] = {}
+    # Workflow-based billing: base platform fee plus individual workflow pricing
+    if plan.workflow_config:
+        cfg = plan.workflow_config
         
-        for cfg in billing_model.activity_config:
-            if not cfg.is_active:
-                continue
-                
-            activity_cost = 0.0
-            
-            # Add base agent fee if configured
-            if cfg.base_agent_fee > 0:
-                activity_cost += cfg.base_agent_fee * agents
-            
-            # Calculate unit-based cost with volume pricing
-            if cfg.volume_pricing_enabled and units_used > 0:
-                # Apply tiered pricing
-                remaining_units = units_used
-                
-                # Tier 1
-                if cfg.volume_tier_1_threshold and cfg.volume_tier_1_price is not None and remaining_units > 0:
-                    tier_1_units = min(remaining_units, cfg.volume_tier_1_threshold)
-                    if tier_1_units > 0:
-                        activity_cost += tier_1_units * cfg.volume_tier_1_price
-                        remaining_units -= tier_1_units
-                
-                # Tier 2
-                if (cfg.volume_tier_2_threshold and cfg.volume_tier_2_price is not None and 
-                    remaining_units > 0 and cfg.volume_tier_1_threshold):
-                    tier_2_units = min(remaining_units, cfg.volume_tier_2_threshold - cfg.volume_tier_1_threshold)
-                    if tier_2_units > 0:
-                        activity_cost += tier_2_units * cfg.volume_tier_2_price
-                        remaining_units -= tier_2_units
-                
-                # Tier 3
-                if (cfg.volume_tier_3_threshold and cfg.volume_tier_3_price is not None and 
-                    remaining_units > 0 and cfg.volume_tier_2_threshold):
-                    tier_3_units = min(remaining_units, cfg.volume_tier_3_threshold - cfg.volume_tier_2_threshold)
-                    if tier_3_units > 0:
-                        activity_cost += tier_3_units * cfg.volume_tier_3_price
-                        remaining_units -= tier_3_units
-                
-                # Any remaining units use the highest tier price or base price
-                if remaining_units > 0:
-                    final_price = cfg.volume_tier_3_price if cfg.volume_tier_3_price is not None else cfg.price_per_unit
-                    activity_cost += remaining_units * final_price
-            else:
-                # Simple unit-based pricing
-                activity_cost += cfg.price_per_unit * units_used
-            
-            # Apply minimum charge if configured
-            if cfg.minimum_charge > 0:
-                activity_cost = max(activity_cost, cfg.minimum_charge)
-                
-            total_cost += activity_cost
-    elif current_model_type == "outcome":
-        # Enhanced outcome-based billing with sophisticated pricing
-        outcome_value = usage_data.get("outcome_value", 0)
+        # Add base platform fee (subscription component)
+        total_cost += cfg.base_platform_fee
         
-        for cfg in billing_model.outcome_config:
-            if not cfg.is_active:
-                continue
-                
-            config_cost = 0.0
-            
-            # Add base platform fee (covers operational costs)
-            config_cost += cfg.base_platform_fee
-            
-            # Skip outcome-based charges if no value
-            if outcome_value <= 0:
-                total_cost += config_cost
-                continue
-            
-            # Check minimum attribution value
-            if cfg.minimum_attribution_value and outcome_value < cfg.minimum_attribution_value:
-                total_cost += config_cost  # Only platform fee
+        # Process each workflow type
+        workflow_usage = usage_data.get("workflows", {})  # Expected format: {"lead_research": 10, "financial_forecast": 5}
+        
+        for workflow_type in plan.workflow_types:
+            workflow_count = workflow_usage.get(workflow_type.workflow_type, 0)
+            if workflow_count <= 0:
                 continue
             
-            # Calculate outcome-based fee using tiered pricing if configured
-            outcome_fee = 0.0
-            percentage_based_fee = 0.0
-            fixed_fee = 0.0
-
-            # 1. Calculate percentage-based fee
-            if cfg.percentage is not None and cfg.percentage > 0:
-                remaining_value = outcome_value
-                
-                # Apply tiered pricing if configured
-                if cfg.tier_1_threshold and cfg.tier_1_percentage:
-                    # Tier 1
-                    tier_1_value = min(remaining_value, cfg.tier_1_threshold)
-                    percentage_based_fee += tier_1_value * (cfg.tier_1_percentage / 100.0)
-                    remaining_value -= tier_1_value
-                    
-                    # Tier 2
-                    if remaining_value > 0 and cfg.tier_2_threshold and cfg.tier_2_percentage:
-                        tier_2_value = min(remaining_value, cfg.tier_2_threshold - cfg.tier_1_threshold)
-                        percentage_based_fee += tier_2_value * (cfg.tier_2_percentage / 100.0)
-                        remaining_value -= tier_2_value
-                        
-                        # Tier 3
-                        if remaining_value > 0 and cfg.tier_3_threshold and cfg.tier_3_percentage:
-                            tier_3_value = min(remaining_value, cfg.tier_3_threshold - cfg.tier_2_threshold)
-                            percentage_based_fee += tier_3_value * (cfg.tier_3_percentage / 100.0)
-                            remaining_value -= tier_3_value
-                    
-                    # Any remaining value uses highest tier percentage or base percentage
-                    if remaining_value > 0:
-                        final_percentage = cfg.tier_3_percentage if cfg.tier_3_percentage else cfg.percentage
-                        percentage_based_fee += remaining_value * (final_percentage / 100.0)
-                else:
-                    # Simple percentage-based pricing
-                    percentage_based_fee = outcome_value * (cfg.percentage / 100.0)
-
-            # 2. Calculate fixed charge fee
-            if cfg.fixed_charge_per_outcome is not None and cfg.fixed_charge_per_outcome > 0:
-                outcome_count = usage_data.get("outcome_count", 1) # Default to 1 if value > 0
-                fixed_fee = cfg.fixed_charge_per_outcome * outcome_count
-
-            outcome_fee = percentage_based_fee + fixed_fee
-            
-            # Apply risk premium if configured
-            if cfg.risk_premium_percentage > 0:
-                risk_adjustment = outcome_fee * (cfg.risk_premium_percentage / 100.0)
-                outcome_fee += risk_adjustment
+            workflow_cost = 0.0
             
-            # Apply success bonus if threshold is met
-            if cfg.success_bonus_threshold and cfg.success_bonus_percentage and outcome_value >= cfg.success_bonus_threshold:
-                bonus = outcome_value * (cfg.success_bonus_percentage / 100.0)
-                outcome_fee += bonus
-            
-            # Apply monthly cap if configured (should apply to total config cost)
-            if cfg.monthly_cap_amount and config_cost + outcome_fee > cfg.monthly_cap_amount:
-                config_cost = cfg.monthly_cap_amount
+            # Apply volume pricing if configured for this workflow type
+            if workflow_type.volume_ladder is not None:
+                workflow_cost = _tiered_cost(workflow_count, workflow_type.volume_ladder)
             else:
-                config_cost += outcome_fee
-            
-            total_cost += config_cost
-    elif current_model_type == "workflow":
-        # Workflow-based billing: base platform fee plus individual workflow pricing
-        if billing_model.workflow_config:
-            cfg = billing_model.workflow_config
+                # Simple per-workflow pricing
+                workflow_cost = workflow_type.price_per_workflow * workflow_count
             
-            # Add base platform fee (subscription component)
-            total_cost += cfg.base_platform_fee
-            
-            # Process each workflow type
-            workflow_usage = usage_data.get("workflows", {})  # Expected format: {"lead_research": 10, "financial_forecast": 5}
+            # Apply minimum charge if configured
+            if workflow_type.minimum_charge and workflow_type.minimum_charge > 0:
+                workflow_cost = max(workflow_cost, workflow_type.minimum_charge)
             
-            for workflow_type in billing_model.workflow_types:
-                if not workflow_type.is_active:
-                    continue
-                
-                workflow_count = workflow_usage.get(workflow_type.workflow_type, 0)
-                if workflow_count <= 0:
-                    continue
-                
-                workflow_cost = 0.0
-                
-                # Apply volume pricing if configured for this workflow type
-                if (workflow_type.volume_tier_1_threshold and workflow_type.volume_tier_1_price is not None and 
-                    workflow_count > 0):
-                    remaining_workflows = workflow_count
-                    
-                    # Tier 1 - first workflows up to tier 1 threshold get tier 1 price
-                    tier_1_workflows = min(remaining_workflows, workflow_type.volume_tier_1_threshold)
-                    workflow_cost += tier_1_workflows * workflow_type.volume_tier_1_price
-                    remaining_workflows -= tier_1_workflows
-                    
-                    # Tier 2
-                    if (workflow_type.volume_tier_2_threshold and workflow_type.volume_tier_2_price is not None and 
-                        remaining_workflows > 0):
-                        tier_2_workflows = min(remaining_workflows, 
-                                             workflow_type.volume_tier_2_threshold - workflow_type.volume_tier_1_threshold)
-                        workflow_cost += tier_2_workflows * workflow_type.volume_tier_2_price
-                        remaining_workflows -= tier_2_workflows
-                    
-                    # Tier 3
-                    if (workflow_type.volume_tier_3_threshold and workflow_type.volume_tier_3_price is not None and 
-                        remaining_workflows > 0):
-                        tier_3_workflows = min(remaining_workflows, 
-                                             workflow_type.volume_tier_3_threshold - workflow_type.volume_tier_2_threshold)
-                        workflow_cost += tier_3_workflows * workflow_type.volume_tier_3_price
-                        remaining_workflows -= tier_3_workflows
-                    
-                    # Any remaining workflows use the highest tier price or base price
-                    if remaining_workflows > 0:
-                        final_price = (workflow_type.volume_tier_3_price if workflow_type.volume_tier_3_price is not None 
-                                     else workflow_type.price_per_workflow)
-                        workflow_cost += remaining_workflows * final_price
-                else:
-                    # Simple per-workflow pricing
-                    workflow_cost = workflow_type.price_per_workflow * workflow_count
-                
-                # Apply minimum charge if configured
-                if workflow_type.minimum_charge and workflow_type.minimum_charge > 0:
-                    workflow_cost = max(workflow_cost, workflow_type.minimum_charge)
-                
-                # Apply overage multiplier if this is beyond commitment
-                commitment_exceeded = usage_data.get("commitment_exceeded", False)
-                if commitment_exceeded and cfg.overage_multiplier > 1.0:
-                    workflow_cost *= cfg.overage_multiplier
-                
-                total_cost += workflow_cost
+            # Apply overage multiplier if this is beyond commitment
+            commitment_exceeded = usage_data.get("commitment_exceeded", False)
+            if commitment_exceeded and cfg.overage_multiplier > 1.0:
+                workflow_cost *= cfg.overage_multiplier
             
-            # Apply global volume discount if enabled
-            total_workflows = sum(workflow_usage.values())
-            if (cfg.volume_discount_enabled and total_workflows >= (cfg.volume_discount_threshold or 0) and 
-                cfg.volume_discount_percentage):
-                discount = total_cost * (cfg.volume_discount_percentage / 100.0)
-                total_cost -= discount
-    return total_cost
\ No newline at end of file
+            workflow_costs[workflow_type.workflow_type] = workflow_cost
+            total_cost += workflow_cost
+        
+        # Apply global volume discount if enabled
+        total_workflows = sum(workflow_usage.values())
+        if (cfg.volume_discount_enabled and total_workflows >= (cfg.volume_discount_threshold or 0) and 
+            cfg.volume_discount_percentage):
+            discount = total_cost * (cfg.volume_discount_percentage / 100.0)
+            total_cost -= discount
+    return total_cost, workflow_costs
@@ -1,9 +1,13 @@
+from datetime import datetime, timezone
 from typing import List
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.billing_model import BillingModel
 from app.models.organization import Organization
-from app.schemas.billing_model import BillingModelCreate, BillingModelUpdate
+from app.schemas.billing_model import BillingModelConfigFields, BillingModelCreate, BillingModelUpdate
+from app.services.agent.billing_cache import invalidate_billing_config
+from app.services.agent.stats_cache import invalidate_agent_stats
 from .validation import validate_billing_config_from_schema
+from .snapshot import refresh_config_snapshot
 from .config import (
     create_agent_config, create_activity_config, create_outcome_config, create_workflow_config, delete_all_configs
 )
@@ -12,16 +16,18 @@ import logging
 logger = logging.getLogger(__name__)
 
 # --- Centralized config field lists ---
-CONFIG_FIELDS = [
-    # Agent
-    "agent_base_agent_fee", "agent_billing_frequency", "agent_setup_fee", "agent_volume_discount_enabled", "agent_volume_discount_threshold", "agent_volume_discount_percentage", "agent_tier", "agent_human_equivalent_value",
-    # Activity
-    "activity_price_per_unit", "activity_activity_type", "activity_unit_type", "activity_base_agent_fee", "activity_volume_pricing_enabled", "activity_volume_tier_1_threshold", "activity_volume_tier_1_price", "activity_volume_tier_2_threshold", "activity_volume_tier_2_price", "activity_volume_tier_3_threshold", "activity_volume_tier_3_price", "activity_minimum_charge", "activity_billing_frequency", "activity_is_active", "activity_human_equivalent_value",
-    # Outcome
-    "outcome_outcome_name", "outcome_outcome_type", "outcome_description", "outcome_base_platform_fee", "outcome_platform_fee_frequency", "outcome_percentage", "outcome_fixed_charge_per_outcome", "outcome_attribution_window_days", "outcome_minimum_attribution_value", "outcome_requires_verification", "outcome_success_rate_assumption", "outcome_risk_premium_percentage", "outcome_monthly_cap_amount", "outcome_success_bonus_threshold", "outcome_success_bonus_percentage", "outcome_tier_1_threshold", "outcome_tier_1_percentage", "outcome_tier_2_threshold", "outcome_tier_2_percentage", "outcome_tier_3_threshold", "outcome_tier_3_percentage", "outcome_billing_frequency", "outcome_currency", "outcome_is_active", "outcome_auto_bill_verified_outcomes", "outcome_human_equivalent_value",
-    # Workflow
-    "workflow_base_platform_fee", "workflow_platform_fee_frequency", "workflow_default_billing_frequency", "workflow_volume_discount_enabled", "workflow_volume_discount_threshold", "workflow_volume_discount_percentage", "workflow_overage_multiplier", "workflow_currency", "workflow_is_active", "workflow_human_equivalent_value", "workflow_types", "commitment_tiers"
-]
+CONFIG_FIELDS = frozenset(BillingModelConfigFields.model_fields)
+
+# One-to-one configs are joined; collections use selectin loading so several
+# collections on one model don't multiply into a cartesian product of rows.
+CONFIG_LOAD_OPTIONS = (
+    joinedload(BillingModel.agent_config),
+    joinedload(BillingModel.workflow_config),
+    selectinload(BillingModel.activity_config),
+    selectinload(BillingModel.outcome_config),
+    selectinload(BillingModel.workflow_types),
+    selectinload(BillingModel.commitment_tiers),
+)
 
 # --- CRUD functions ---
 def get_billing_model(db: Session, model_id: int) -> BillingModel:
@@ -30,14 +36,7 @@ def get_billing_model(db: Session, model_id: int) -> BillingModel:
     """
     model = (
         db.query(BillingModel)
-        .options(
-            joinedload(BillingModel.agent_config),
-            joinedload(BillingModel.activity_config),
-            joinedload(BillingModel.outcome_config),
-            joinedload(BillingModel.workflow_config),
-            joinedload(BillingModel.workflow_types),
-            joinedload(BillingModel.commitment_tiers)
-        )
+        .options(*CONFIG_LOAD_OPTIONS)
         .filter(BillingModel.id == model_id)
         .first()
     )
@@ -51,14 +50,7 @@ def get_billing_models_by_organization(db: Session, org_id: int, skip: int = 0,
     """
     return (
         db.query(BillingModel)
-        .options(
-            joinedload(BillingModel.agent_config),
-            joinedload(BillingModel.activity_config),
-            joinedload(BillingModel.outcome_config),
-            joinedload(BillingModel.workflow_config),
-            joinedload(BillingModel.workflow_types),
-            joinedload(BillingModel.commitment_tiers)
-        )
+        .options(*CONFIG_LOAD_OPTIONS)
         .filter(BillingModel.organization_id == org_id)
         .offset(skip)
         .limit(limit)
@@ -104,6 +96,7 @@ def create_billing_model(db: Session, billing_model_in: BillingModelCreate) -> B
     config_creator = config_creators.get(billing_model_in.model_type)
     if config_creator:
         config_creator(db, billing_model, billing_model_in)
+    refresh_config_snapshot(db, billing_model)
     db.commit()
     created_billing_model = get_billing_model(db, model_id=model_id_val)
     logger.info(f"Created new billing model: {created_billing_model.name} for organization {organization.name}")
@@ -122,7 +115,7 @@ def update_billing_model(db: Session, model_id: int, billing_model_in: BillingMo
                 f"Invalid billing model type: {update_data['model_type']}. "
                 f"Must be one of: {', '.join(valid_types)}"
             )
-    if any(field in update_data for field in CONFIG_FIELDS):
+    if not CONFIG_FIELDS.isdisjoint(update_data):
         current_model_type = str(billing_model.model_type)
         validate_billing_config_from_schema(billing_model_in, current_model_type)
         model_type_changing = "model_type" in update_data
@@ -140,7 +133,13 @@ def update_billing_model(db: Session, model_id: int, billing_model_in: BillingMo
     for field, value in update_data.items():
         if hasattr(billing_model, field):
             setattr(billing_model, field, value)
+    # updated_at versions cached cost functions; bump it even when only config rows changed
+    billing_model.updated_at = datetime.now(timezone.utc)
+    refresh_config_snapshot(db, billing_model)
     db.commit()
+    # Agents on this model serve their config from cache; drop all entries
+    invalidate_billing_config()
+    invalidate_agent_stats()
     updated_billing_model = get_billing_model(db, model_id=model_id)
     logger.info(f"Updated billing model: {updated_billing_model.name}")
     return updated_billing_model
@@ -154,5 +153,7 @@ def delete_billing_model(db: Session, model_id: int) -> BillingModel:
         raise ValueError("Cannot delete billing model that is in use by agents")
     db.delete(billing_model)
     db.commit()
+    invalidate_billing_config()
+    invalidate_agent_stats()
     logger.info(f"Deleted billing model: {billing_model.name}")
     return billing_model
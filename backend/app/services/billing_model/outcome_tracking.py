@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.models.billing_model import BillingModel, OutcomeBasedConfig, OutcomeMetric, OutcomeVerificationRule
 from app.models.agent import Agent
 from app.schemas.billing_model import OutcomeMetricCreate, OutcomeMetricUpdate
-from .calculation import calculate_cost
+from .calculation import get_cost_fn
 import logging
 import json
 
@@ -27,7 +27,7 @@ def record_outcome(
     Record an outcome for an agent and calculate billing
     """
     # Get agent and billing model
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = db.get(Agent, agent_id)
     if not agent:
         raise ValueError(f"Agent with ID {agent_id} not found")
     
@@ -54,7 +54,7 @@ def record_outcome(
     
     # Calculate fee using the enhanced calculation logic
     usage_data = {"outcome_value": outcome_value}
-    calculated_fee = calculate_cost(billing_model, usage_data)
+    calculated_fee = get_cost_fn(billing_model)(usage_data)
     
     # Determine tier applied
     tier_applied = _determine_tier_applied(outcome_config, outcome_value)
@@ -105,7 +105,7 @@ def verify_outcome(
     """
     Verify an outcome metric and update billing status with rule validation
     """
-    outcome_metric = db.query(OutcomeMetric).filter(OutcomeMetric.id == outcome_metric_id).first()
+    outcome_metric = db.get(OutcomeMetric, outcome_metric_id)
     if not outcome_metric:
         raise ValueError(f"Outcome metric with ID {outcome_metric_id} not found")
     
@@ -248,7 +248,7 @@ def update_outcome_metric(
     """
     Update an outcome metric using schema validation
     """
-    outcome_metric = db.query(OutcomeMetric).filter(OutcomeMetric.id == outcome_metric_id).first()
+    outcome_metric = db.get(OutcomeMetric, outcome_metric_id)
     if not outcome_metric:
         raise ValueError(f"Outcome metric with ID {outcome_metric_id} not found")
     
@@ -0,0 +1,114 @@
+"""
+Denormalized billing config snapshot stored on BillingModel.config_snapshot.
+"""
+from typing import Any, Dict
+
+from app.models.billing_model import BillingModel
+
+# Relationships the snapshot is built from
+SNAPSHOT_RELATIONSHIPS = (
+    "agent_config", "activity_config", "outcome_config",
+    "workflow_config", "workflow_types", "commitment_tiers",
+)
+
+
+def build_config_snapshot(bm: BillingModel) -> Dict[str, Any]:
+    """
+    Build the effective billing configuration for a billing model
+    """
+    config = {
+        "model_type": bm.model_type,
+        "model_id": bm.id,
+        "model_name": bm.name,
+        "is_active": bm.is_active
+    }
+    
+    # Add type-specific config
+    if bm.model_type == "agent" and bm.agent_config:
+        config["agent_config"] = {
+            "base_agent_fee": bm.agent_config.base_agent_fee,
+            "billing_frequency": bm.agent_config.billing_frequency,
+            "agent_tier": bm.agent_config.agent_tier
+        }
+    elif bm.model_type == "activity" and bm.activity_config:
+        config["activity_configs"] = [
+            {
+                "activity_type": cfg.activity_type,
+                "price_per_unit": cfg.price_per_unit,
+                "unit_type": cfg.unit_type,
+                "is_active": cfg.is_active
+            } for cfg in bm.activity_config
+        ]
+    elif bm.model_type == "outcome" and bm.outcome_config:
+        config["outcome_configs"] = [
+            {
+                "outcome_type": cfg.outcome_type,
+                "outcome_name": cfg.outcome_name,
+                "percentage": cfg.percentage,
+                "requires_verification": cfg.requires_verification,
+                "is_active": cfg.is_active
+            } for cfg in bm.outcome_config
+        ]
+    elif bm.model_type == "workflow" and bm.workflow_types:
+        config["workflow_config"] = {
+            "base_platform_fee": bm.workflow_config.base_platform_fee,
+            "platform_fee_frequency": bm.workflow_config.platform_fee_frequency,
+            "default_billing_frequency": bm.workflow_config.default_billing_frequency,
+            "currency": bm.workflow_config.currency,
+            "volume_discount_enabled": bm.workflow_config.volume_discount_enabled,
+            "volume_discount_threshold": bm.workflow_config.volume_discount_threshold,
+            "volume_discount_percentage": bm.workflow_config.volume_discount_percentage,
+            "overage_multiplier": bm.workflow_config.overage_multiplier,
+            "is_active": bm.workflow_config.is_active
+        }
+        config["workflow_types"] = [
+            {
+                "workflow_type": wt.workflow_type,
+                "workflow_name": wt.workflow_name,
+                "description": wt.description,
+                "price_per_workflow": wt.price_per_workflow,
+                "complexity_level": wt.complexity_level,
+                "estimated_compute_cost": wt.estimated_compute_cost,
+                "estimated_duration_minutes": wt.estimated_duration_minutes,
+                "expected_roi_multiplier": wt.expected_roi_multiplier,
+                "business_value_category": wt.business_value_category,
+                "volume_tier_1_threshold": wt.volume_tier_1_threshold,
+                "volume_tier_1_price": wt.volume_tier_1_price,
+                "volume_tier_2_threshold": wt.volume_tier_2_threshold,
+                "volume_tier_2_price": wt.volume_tier_2_price,
+                "volume_tier_3_threshold": wt.volume_tier_3_threshold,
+                "volume_tier_3_price": wt.volume_tier_3_price,
+                "billing_frequency": wt.billing_frequency,
+                "minimum_charge": wt.minimum_charge,
+                "is_active": wt.is_active
+            } for wt in bm.workflow_types
+        ]
+        if bm.commitment_tiers:
+            config["commitment_tiers"] = [
+                {
+                    "tier_name": ct.tier_name,
+                    "tier_level": ct.tier_level,
+                    "description": ct.description,
+                    "minimum_workflows_per_month": ct.minimum_workflows_per_month,
+                    "minimum_monthly_revenue": ct.minimum_monthly_revenue,
+                    "included_workflows": ct.included_workflows,
+                    "included_workflow_types": ct.included_workflow_types,
+                    "discount_percentage": ct.discount_percentage,
+                    "platform_fee_discount": ct.platform_fee_discount,
+                    "commitment_period_months": ct.commitment_period_months,
+                    "overage_rate_multiplier": ct.overage_rate_multiplier,
+                    "is_active": ct.is_active,
+                    "is_popular": ct.is_popular
+                } for ct in bm.commitment_tiers
+            ]
+    
+    return config
+
+
+def refresh_config_snapshot(db, billing_model: BillingModel) -> None:
+    """
+    Rebuild billing_model.config_snapshot from its current config rows
+    """
+    db.flush()
+    db.expire(billing_model, SNAPSHOT_RELATIONSHIPS)
+    billing_model.config_snapshot = build_config_snapshot(billing_model)
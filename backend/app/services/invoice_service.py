@@ -18,7 +18,7 @@ def get_invoice(db: Session, invoice_id: int) -> Optional[Invoice]:
     """
     Get invoice by ID
     """
-    return db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    return db.get(Invoice, invoice_id)
 
 
 def get_invoice_by_number(db: Session, invoice_number: str) -> Optional[Invoice]:
@@ -219,7 +219,7 @@ def get_invoice_with_items(db: Session, invoice_id: int) -> Optional[Invoice]:
     """
     Get invoice with line items
     """
-    return db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    return db.get(Invoice, invoice_id)
 
 def generate_monthly_invoice(db: Session, org_id: int, month: int, year: int) -> Invoice:
     """
@@ -21,7 +21,7 @@ def get_organization(db: Session, org_id: int) -> Optional[Organization]:
     """
     Get organization by ID
     """
-    return db.query(Organization).filter(Organization.id == org_id).first()
+    return db.get(Organization, org_id)
 
 
 def get_organization_by_name(db: Session, name: str) -> Optional[Organization]:
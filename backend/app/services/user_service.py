@@ -22,7 +22,7 @@ def get_user(db: Session, user_id: int) -> Optional[User]:
     """
     Get a user by ID
     """
-    return db.query(User).filter(User.id == user_id).first()
+    return db.get(User, user_id)
 
 
 def get_users(db: Session, skip: int = 0, limit: int = 100):
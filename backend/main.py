@@ -8,6 +8,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 from app.api.v1.api import api_router
+from app.schemas import warm_up_schemas
 from app.core.config import settings
 from init_db import init_db
 
@@ -57,6 +58,8 @@ async def lifespan(app: FastAPI):
         logger.error("Please check your database configuration and try again.")
         raise
     
+    warm_up_schemas()
+    
     logger.info("Xyra application startup completed!")
     yield
     # Shutdown
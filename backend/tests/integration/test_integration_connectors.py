@@ -268,6 +268,21 @@ class TestConnectorErrorHandling:
         
         assert response.status_code == 422  # Validation error
 
+    @pytest.mark.parametrize("schema_type, value", [
+        ("Identifier", "conn_1\n"),
+        ("HttpMethod", "GET\n"),
+        ("BulkOperation", "start\n"),
+    ])
+    def test_pattern_rejects_trailing_newline(self, schema_type, value):
+        """Test that shared pattern types match the whole string, not up to a trailing newline."""
+        from pydantic import TypeAdapter, ValidationError
+        from app.schemas import integration
+
+        with pytest.raises(ValidationError) as exc_info:
+            TypeAdapter(getattr(integration, schema_type)).validate_python(value)
+        assert exc_info.value.errors()[0]["type"] == "string_pattern_mismatch"
+        assert TypeAdapter(getattr(integration, schema_type)).validate_python(value.strip()) == value.strip()
+
 
 class TestMultiTenantIsolation:
     """Test multi-tenant isolation in connector operations."""
@@ -101,6 +101,35 @@ class TestAgentLifecycle:
         act = response.json()
         assert act["agent_id"] == agent_id
 
+    def test_record_activities_batch(self, client, token):
+        headers = {"Authorization": f"Bearer {token}"}
+        agent_id = TestAgentLifecycle.agent_id
+        assert agent_id is not None, "Agent must be created first"
+        body = [
+            {"agent_id": agent_id, "activity_type": "api_call"},
+            {"agent_id": agent_id, "activity_type": "query"},
+        ]
+        response = client.post(
+            f"/api/v1/agents/{agent_id}/activities/batch", json=body, headers=headers
+        )
+        assert response.status_code == 200
+        acts = response.json()
+        assert [act["activity_type"] for act in acts] == ["api_call", "query"]
+        assert all(act["agent_id"] == agent_id for act in acts)
+
+    def test_record_activities_batch_rejects_oversized_batch(self, client, token):
+        from app.api.v1.endpoints.agents import MAX_ACTIVITY_BATCH_SIZE
+
+        headers = {"Authorization": f"Bearer {token}"}
+        agent_id = TestAgentLifecycle.agent_id
+        assert agent_id is not None, "Agent must be created first"
+        body = [{"agent_id": agent_id, "activity_type": "api_call"}] * (MAX_ACTIVITY_BATCH_SIZE + 1)
+        response = client.post(
+            f"/api/v1/agents/{agent_id}/activities/batch", json=body, headers=headers
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "too_long"
+
     def test_record_cost(self, client, token):
         headers = {"Authorization": f"Bearer {token}"}
         agent_id = TestAgentLifecycle.agent_id
@@ -133,6 +162,10 @@ class TestAgentLifecycle:
         assert response.status_code == 200
         stats = response.json()
         assert stats.get("activity_count", None) is not None
+        # One single activity plus a batch of two, kept as running totals
+        assert stats["activity_count"] == 3
+        assert stats["total_outcomes_value"] == pytest.approx(10.0)
+        assert stats["total_cost"] >= 5.0
 
     def test_delete_agent(self, client, token):
         headers = {"Authorization": f"Bearer {token}"}
@@ -163,7 +196,10 @@ class TestAgentLifecycle:
             assert "agent_id" in summary
             assert "total_cost" in summary
             assert "cost_by_type" in summary
-        
+            by_type = summary["cost_by_type"]
+            assert summary["total_cost"] == pytest.approx(sum(t["total"] for t in by_type.values()))
+            assert len(summary["cost_breakdown"]) == sum(t["count"] for t in by_type.values())
+
         # Test workflow validation endpoint
         workflow_data = {
             "workflow_executions": {
@@ -267,3 +303,115 @@ class TestAgentServiceFunctions:
         assert 'db' in params
         assert 'agent_id' in params
         assert 'workflow_executions' in params
+
+    def test_billing_config_cache_expiry_and_invalidation(self, monkeypatch):
+        """Test that cached billing configs expire and can be invalidated"""
+        from app.services.agent import billing_cache
+
+        billing_cache.set_cached_billing_config(-1, {"model_type": "activity"})
+        assert billing_cache.get_cached_billing_config(-1) == {"model_type": "activity"}
+
+        billing_cache.invalidate_billing_config(-1)
+        assert billing_cache.get_cached_billing_config(-1) is None
+
+        billing_cache.set_cached_billing_plan(-1, "plan")
+        assert billing_cache.get_cached_billing_plan(-1) == "plan"
+        billing_cache.invalidate_billing_config(-1)
+        assert billing_cache.get_cached_billing_plan(-1) is None
+
+        monkeypatch.setattr(billing_cache, "BILLING_CONFIG_TTL_SECONDS", -1.0)
+        billing_cache.set_cached_billing_config(-1, {"model_type": "activity"})
+        assert billing_cache.get_cached_billing_config(-1) is None
+
+    def test_config_by_type_keeps_first_config_of_a_type(self):
+        """Test that duplicate config types resolve to the first config, as a linear scan would"""
+        from app.models import ActivityBasedConfig, BillingModel, WorkflowType
+
+        bm = BillingModel(name="Dupes", model_type="activity")
+        first = ActivityBasedConfig(activity_type="api_call", price_per_unit=0.1)
+        second = ActivityBasedConfig(activity_type="api_call", price_per_unit=0.5)
+        bm.activity_config = [first, second]
+        assert bm.activity_config_by_type["api_call"] is first
+
+        inactive = WorkflowType(workflow_type="research", workflow_name="Old", price_per_workflow=1.0, is_active=False)
+        active = WorkflowType(workflow_type="research", workflow_name="New", price_per_workflow=2.0, is_active=True)
+        bm.workflow_types = [inactive, active]
+        assert bm.workflow_types_by_type["research"] is inactive
+
+    def test_billing_plan_is_checked_against_billing_model_version(self, db_session):
+        """Test that a cached billing plan is rebuilt on price changes and dropped with its agent"""
+        from datetime import datetime
+        from sqlalchemy import delete, update
+        from app.models import Agent, BillingModel, Organization
+        from app.services.agent import billing
+
+        org = Organization(name="Plan Version Org")
+        db_session.add(org)
+        db_session.flush()
+        bm = BillingModel(name="Plan Version Model", organization_id=org.id, model_type="agent")
+        db_session.add(bm)
+        db_session.flush()
+        agent = Agent(name="Plan Version Agent", organization_id=org.id, billing_model_id=bm.id)
+        db_session.add(agent)
+        db_session.commit()
+        agent_id = agent.id
+        db_session.expire_all()
+
+        plan = billing.get_agent_billing_plan(db_session, agent_id)
+        assert billing.get_agent_billing_plan(db_session, agent_id) is plan
+
+        # Another worker edits the billing model without touching this process's cache
+        db_session.execute(
+            update(BillingModel).where(BillingModel.id == bm.id).values(updated_at=datetime(2030, 1, 1))
+        )
+        db_session.commit()
+        rebuilt = billing.get_agent_billing_plan(db_session, agent_id)
+        assert rebuilt is not plan
+
+        db_session.execute(delete(Agent).where(Agent.id == agent_id))
+        db_session.commit()
+        assert billing.get_agent_billing_plan(db_session, agent_id) is None
+
+    def test_billing_config_type_sets_are_cached_beside_the_config(self):
+        """Test that configured type sets back validation without being added to the config"""
+        from app.services.agent import billing, billing_cache
+
+        config = {"model_type": "activity", "activity_configs": [{"activity_type": "api_call"}]}
+        billing_cache.set_cached_billing_config(-1, config, billing._config_type_sets(config))
+        assert set(config) == {"model_type", "activity_configs"}
+        assert billing_cache.get_cached_config_type_sets(-1, config) == {"activity_type_set": {"api_call"}}
+        assert billing.validate_agent_billing_data(None, -1, "activity", {"activity_type": "api_call"}, config=config)
+        assert not billing.validate_agent_billing_data(None, -1, "activity", {"activity_type": "query"}, config=config)
+
+        # A config that is not the cached one is checked against its own list
+        other = {"model_type": "activity", "activity_configs": [{"activity_type": "query"}]}
+        assert billing_cache.get_cached_config_type_sets(-1, other) is None
+        assert billing.validate_agent_billing_data(None, -1, "activity", {"activity_type": "query"}, config=other)
+        billing_cache.invalidate_billing_config(-1)
+
+    def test_billing_summary_cache_is_per_agent_and_key(self):
+        """Test that cached billing summaries are keyed per query and dropped per agent"""
+        from app.services.agent import stats_cache
+
+        stats_cache.set_cached_billing_summary(-1, (None, None), {"total_cost": 1.0})
+        stats_cache.set_cached_billing_summary(-1, ("2024-01-01", None), {"total_cost": 2.0})
+        stats_cache.set_cached_billing_summary(-2, (None, None), {"total_cost": 3.0})
+        assert stats_cache.get_cached_billing_summary(-1, ("2024-01-01", None)) == {"total_cost": 2.0}
+
+        stats_cache.invalidate_agent_stats(-1)
+        assert stats_cache.get_cached_billing_summary(-1, (None, None)) is None
+        assert stats_cache.get_cached_billing_summary(-1, ("2024-01-01", None)) is None
+        assert stats_cache.get_cached_billing_summary(-2, (None, None)) == {"total_cost": 3.0}
+        stats_cache.invalidate_agent_stats()
+
+    def test_billing_summary_cache_caps_entries_per_agent(self, monkeypatch):
+        """Test that each agent keeps a bounded number of summaries, oldest evicted first"""
+        from app.services.agent import stats_cache
+
+        monkeypatch.setattr(stats_cache, "STATS_CACHE_ENTRIES_PER_AGENT", 2)
+        for day in range(3):
+            stats_cache.set_cached_billing_summary(-1, (day, None), {"total_cost": float(day)})
+        assert stats_cache.get_cached_billing_summary(-1, (0, None)) is None
+        assert stats_cache.get_cached_billing_summary(-1, (2, None)) == {"total_cost": 2.0}
+        assert len(stats_cache._cache[-1]) == 2
+        stats_cache.invalidate_agent_stats()
@@ -28,3 +28,56 @@ def test_read_users_me(client, token):
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == "admin@example.com"
+
+
+def test_read_users_me_rejects_non_string_subject(client):
+    import jwt
+    from app.core.config import settings
+
+    bad_token = jwt.encode({"sub": 1}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    response = client.get(
+        "/api/v1/auth/me",
+        headers={"Authorization": f"Bearer {bad_token}"}
+    )
+    assert response.status_code == 401
+
+
+def test_api_key_authentication_is_cached_until_key_changes(db_session):
+    from app.models.organization import Organization
+    from app.models.user import User
+    from sqlalchemy import update
+    from app.models.api_key import ApiKey
+    from app.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
+    from app.services import api_key_service
+
+    org = Organization(name="API Key Org")
+    db_session.add(org)
+    db_session.commit()
+    user = db_session.query(User).filter(User.email == "admin@example.com").first()
+    api_key, full_key = api_key_service.create_api_key(
+        db_session, ApiKeyCreate(name="cached"), user_id=user.id, organization_id=org.id
+    )
+
+    first = api_key_service.authenticate_api_key(db_session, full_key)
+    assert first is not None and first.id == api_key.id
+    db_session.refresh(api_key)
+    last_used = api_key.last_used
+    assert last_used is not None
+
+    # Served from the cache; last_used is not rewritten within the interval
+    second = api_key_service.authenticate_api_key(db_session, full_key)
+    assert second is not None and second.user_id == user.id
+    assert api_key_service._get_cached_api_key(api_key.key_hash) is not None
+    db_session.refresh(api_key)
+    assert api_key.last_used == last_used
+
+    # Revoked elsewhere without touching this process's cache
+    db_session.execute(update(ApiKey).where(ApiKey.id == api_key.id).values(is_active=False))
+    db_session.commit()
+    assert api_key_service.authenticate_api_key(db_session, full_key) is None
+    assert api_key_service._get_cached_api_key(api_key.key_hash) is None
+
+    api_key_service.update_api_key(db_session, api_key.id, user.id, org.id, ApiKeyUpdate(is_active=True))
+    assert api_key_service.authenticate_api_key(db_session, full_key) is not None
+    api_key_service.deactivate_api_key(db_session, api_key.id, user.id, org.id)
+    assert api_key_service.authenticate_api_key(db_session, full_key) is None
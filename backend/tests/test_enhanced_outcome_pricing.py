@@ -149,6 +149,53 @@ def test_outcome_calculation_below_minimum():
     assert abs(cost - expected_cost) < 0.01, f"Expected {expected_cost}, got {cost}"
 
 
+def test_cached_cost_fn_matches_calculate_cost():
+    """Test that the compiled cost function matches calculate_cost and is cached per version"""
+    from datetime import datetime, timezone
+    from app.services.billing_model.calculation import get_cost_fn
+
+    billing_model = BillingModel()
+    setattr(billing_model, 'id', -1)
+    setattr(billing_model, 'model_type', "outcome")
+    setattr(billing_model, 'updated_at', datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    outcome_config = OutcomeBasedConfig()
+    setattr(outcome_config, 'is_active', True)
+    setattr(outcome_config, 'base_platform_fee', 100.0)
+    setattr(outcome_config, 'percentage', 10.0)
+    setattr(outcome_config, 'risk_premium_percentage', 0.0)
+    billing_model.outcome_config = [outcome_config]
+
+    usage_data = {"outcome_value": 1000.0}
+    cost_fn = get_cost_fn(billing_model)
+    assert cost_fn(usage_data) == calculate_cost(billing_model, usage_data) == 200.0
+    assert get_cost_fn(billing_model) is cost_fn
+
+    # A new version of the model compiles a new function
+    setattr(outcome_config, 'percentage', 20.0)
+    setattr(billing_model, 'updated_at', datetime(2025, 1, 2, tzinfo=timezone.utc))
+    assert get_cost_fn(billing_model)(usage_data) == 300.0
+
+
+def test_calculate_cost_batch_matches_calculate_cost():
+    """Test that batch pricing returns one cost per usage record, as calculate_cost would"""
+    from app.services.billing_model.calculation import calculate_cost_batch
+
+    billing_model = BillingModel()
+    setattr(billing_model, 'model_type', "outcome")
+
+    outcome_config = OutcomeBasedConfig()
+    setattr(outcome_config, 'is_active', True)
+    setattr(outcome_config, 'base_platform_fee', 100.0)
+    setattr(outcome_config, 'percentage', 10.0)
+    setattr(outcome_config, 'risk_premium_percentage', 0.0)
+    billing_model.outcome_config = [outcome_config]
+
+    usage_rows = [{"outcome_value": 0.0}, {"outcome_value": 1000.0}, {"outcome_value": 5000.0}]
+    costs = calculate_cost_batch(billing_model, usage_rows)
+    assert costs == [calculate_cost(billing_model, usage) for usage in usage_rows] == [100.0, 200.0, 600.0]
+
+
 if __name__ == "__main__":
     test_enhanced_outcome_calculation()
     test_outcome_calculation_with_bonus()
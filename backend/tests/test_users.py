@@ -18,6 +18,25 @@ def test_read_users(client, token):
     assert any(u["email"] == "admin@example.com" for u in data)
 
 
+def test_create_user_rejects_invalid_email(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        "/api/v1/users/",
+        json={**USER_DATA, "email": "not-an-email"},
+        headers=headers
+    )
+    assert response.status_code == 422
+
+
+def test_signup_rejects_invalid_email(client):
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={**USER_DATA, "email": "not-an-email"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "email"]
+
+
 class TestUserLifecycle:
     """Test user CRUD operations in sequence."""
     